@@ -337,4 +337,7 @@ if __name__ == "__main__":
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop and the httptools parser (uvicorn[standard]) instead of asyncio and h11;
+    # auto-reload only when DEV is set
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=bool(os.getenv("DEV")),
+                loop="uvloop", http="httptools")
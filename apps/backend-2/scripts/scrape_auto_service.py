@@ -6,7 +6,7 @@ import os
 def scrape_auto_service():
     url = "https://vogo.family/product/auto-service/"
     response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(response.content, 'lxml')
     
     try:
         # Get the product title
@@ -7,6 +7,8 @@ from typing import List, Dict, Any, Optional, Tuple
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from src.utils.ids import stable_id
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -164,7 +166,7 @@ class RAGEngine:
             # Special handling for auto service data
             if product.get("category") == "Auto Service":
                 formatted_product = {
-                    "id": hash(product.get("url", "") + product.get("title", "")),  # Generate unique ID
+                    "id": stable_id(product.get("url", ""), product.get("title", "")),  # Generate unique ID
                     "name": product.get("title", ""),
                     "price": product.get("price", ""),
                     "description": product.get("description", ""),
@@ -175,7 +177,7 @@ class RAGEngine:
                 }
             else:
                 formatted_product = {
-                    "id": hash(product.get("url", "") + product.get("name", "")),  # Generate unique ID
+                    "id": stable_id(product.get("url", ""), product.get("name", "")),  # Generate unique ID
                     "name": product.get("name", ""),
                     "price": product.get("price", ""),
                     "description": product.get("description", ""),
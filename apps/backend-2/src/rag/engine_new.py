@@ -6,6 +6,8 @@ import traceback
 from typing import List, Dict, Any, Optional, Tuple
 from openai import OpenAI
 
+from src.utils.ids import stable_id
+
 logger = logging.getLogger(__name__)
 
 class RAGEngine:
@@ -154,7 +156,7 @@ class RAGEngine:
                 continue
                 
             formatted_product = {
-                "id": hash(product.get("url", "") + product.get("name", "")),  # Generate unique ID
+                "id": stable_id(product.get("url", ""), product.get("name", "")),  # Generate unique ID
                 "name": product.get("name", ""),
                 "price": product.get("price", ""),
                 "description": product.get("description", ""),
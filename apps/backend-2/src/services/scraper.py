@@ -84,7 +84,7 @@ class VogoScraper:
             # Let's use main navigation links as a fallback approach
             return self._get_categories_from_nav()
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         categories = []
         
         # Extract categories (adapt selectors to match the website structure)
@@ -130,7 +130,7 @@ class VogoScraper:
             logger.error("Failed to get main page")
             return []
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         categories = []
         
         # Try to find main navigation menu items that might be categories
@@ -212,7 +212,7 @@ class VogoScraper:
             logger.error(f"Failed to get product page for {category_name}")
             return []
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         products = []
         
         # Extract products (typical WooCommerce structure)
@@ -380,7 +380,7 @@ class VogoScraper:
             logger.error(f"Failed to get product detail page: {product_url}")
             return {}
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         details = {}
         
         try:
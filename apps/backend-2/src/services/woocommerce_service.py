@@ -10,6 +10,10 @@ from src.utils.cache import Cache
 
 logger = logging.getLogger(__name__)
 
+# Most WooCommerce requests in flight at once per service, so gathered
+# searches stay within the store's rate limits
+MAX_CONCURRENT_REQUESTS = 10
+
 class WooCommerceService:
     """
     Service for interacting with the WooCommerce API.
@@ -37,6 +41,7 @@ class WooCommerceService:
         
         # Initialize session
         self.session = None
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Create and return an HTTP client with authentication."""
@@ -55,7 +60,7 @@ class WooCommerceService:
         
         # If not in cache, make the request
         logger.info(f"Cache miss for {cache_key}, fetching from API")
-        async with await self._get_client() as client:
+        async with self._request_slots, await self._get_client() as client:
             base = self.store_api_url if use_store_api else self.base_url
             url = f"{base}/{endpoint}"
             
@@ -113,6 +118,20 @@ class WooCommerceService:
             logging.error(f"Error getting products from WooCommerce API: {e}")
             return []
             
+    async def search_terms(self, terms: List[str], per_page: int = 20) -> List[List[Dict]]:
+        """
+        Run a product search for each term concurrently.
+        
+        Args:
+            terms: Search terms; repeated terms are only searched once
+            per_page: Maximum number of products per search
+            
+        Returns:
+            One list of products per distinct term, in the order given
+        """
+        distinct_terms = list(dict.fromkeys(terms))
+        return await asyncio.gather(*(self.get_products(search=term, per_page=per_page) for term in distinct_terms))
+
     async def find_product_by_name(self, product_name: str) -> List[Dict]:
         """
         Find a specific product by name using a more thorough search approach.
@@ -310,8 +329,10 @@ class WooCommerceService:
         if location_based:
             # For "near me" queries without specific type, combine multiple service types
             logging.info("Generic location-based query, combining services in the area")
-            restaurant_products = await self.get_restaurant_products()
-            mall_products = await self.get_mall_delivery_products()
+            restaurant_products, mall_products = await asyncio.gather(
+                self.get_restaurant_products(),
+                self.get_mall_delivery_products()
+            )
             return restaurant_products[:5] + mall_products[:5]
             
         # If all else fails, return a mix of popular products
@@ -531,9 +552,8 @@ class WooCommerceService:
             ]
             all_food_products = []
             
-            # Try searching for each food term
-            for term in food_terms:
-                search_results = await self.get_products(search=term, per_page=20)
+            # Search for every food term at once
+            for term, search_results in zip(dict.fromkeys(food_terms), await self.search_terms(food_terms, per_page=20)):
                 if search_results:
                     logging.info(f"Found {len(search_results)} products matching search term '{term}'")
                     all_food_products.extend(search_results)
@@ -546,8 +566,7 @@ class WooCommerceService:
                     "traditional", "vegan", "vegetarian", "pescatarian", "seafood", "steak", "grill"
                 ]
                 
-                for term in cuisine_terms:
-                    cuisine_results = await self.get_products(search=term, per_page=10)
+                for term, cuisine_results in zip(dict.fromkeys(cuisine_terms), await self.search_terms(cuisine_terms, per_page=10)):
                     if cuisine_results:
                         logging.info(f"Found {len(cuisine_results)} products matching cuisine term '{term}'")
                         all_food_products.extend(cuisine_results)
@@ -639,17 +658,19 @@ class WooCommerceService:
         try:
             all_pizza_products = []
             
-            # Try the restaurant category first (ID: 546)
-            restaurant_products = await self.get_products(category=546, per_page=10)
+            # The restaurant category (ID: 546) first, then keyword searches as
+            # backup; all three are requested at once
+            restaurant_products, pizza_products, food_products = await asyncio.gather(
+                self.get_products(category=546, per_page=10),
+                self.get_products(search="pizza", per_page=5),
+                self.get_products(search="food", per_page=5)
+            )
             if restaurant_products:
                 all_pizza_products.extend(restaurant_products)
             
-            # Then try keyword search as backup
-            pizza_products = await self.get_products(search="pizza", per_page=5)
             if pizza_products:
                 all_pizza_products.extend(pizza_products)
                 
-            food_products = await self.get_products(search="food", per_page=5)
             if food_products:
                 all_pizza_products.extend(food_products)
         except Exception as e:
@@ -0,0 +1,19 @@
+import hashlib
+
+
+def stable_id(*parts: str) -> int:
+    """
+    Derive a numeric ID from strings that is the same in every process.
+
+    Unlike hash(), which is salted per interpreter, this gives a product the
+    same ID across workers and restarts. The 48-bit digest stays within the
+    range JavaScript clients can represent exactly.
+
+    Args:
+        parts: Strings identifying the item (e.g. its URL and name)
+
+    Returns:
+        A non-negative integer ID
+    """
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=6).digest()
+    return int.from_bytes(digest, "big")
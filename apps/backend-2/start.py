@@ -16,4 +16,4 @@ if __name__ == "__main__":
     print(f"  • Swagger UI: http://localhost:{port}/docs")
     print(f"  • ReDoc: http://localhost:{port}/redoc")
     
-    uvicorn.run("main:app", host=host, port=port, reload=debug)
+    uvicorn.run("main:app", host=host, port=port, reload=debug, loop="uvloop", http="httptools")
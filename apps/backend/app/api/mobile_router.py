@@ -12,6 +12,9 @@ from app.services.voice_service import VoiceService
 from app.services.shopping_list_service import ShoppingListService
 from app.services.calendar_integration_service import CalendarIntegrationService
 from app.services.woocommerce_service import WooCommerceService
+from app.services.openai_service import get_openai_service
+from app.services.semantic_cache import SemanticCache
+from app.services.conversation_store import ConversationStore
 
 # Initialize services
 voice_service = VoiceService()
@@ -35,6 +38,32 @@ def get_rag_engine():
         rag_engine = RAGEngine(api_key=api_key)
     return rag_engine
 
+# RAG engine conversation state kept server-side by conversation_id, so clients
+# don't have to send it back with every message
+conversation_store = ConversationStore(ttl=3600)
+
+# RAG responses to stateless queries keyed by query embedding, one cache per language
+rag_response_caches: Dict[str, SemanticCache] = {}
+
+# Response actions that only show information; anything else (shopping list
+# adds, calendar events, human handoff, errors) has side effects or is
+# transient and must be recomputed every time
+CACHEABLE_ACTIONS = {None, "show_malls", "browse_products", "restaurant_services", "select_location"}
+
+def get_rag_response_cache(language: str) -> SemanticCache:
+    cache = rag_response_caches.get(language)
+    if cache is None:
+        cache = rag_response_caches[language] = SemanticCache(threshold=0.1, capacity=1024)
+    return cache
+
+async def embed_query(query: str):
+    """Embed a query for the response cache, or None if embeddings aren't available"""
+    try:
+        return await get_openai_service().embed_with_cache(query)
+    except ValueError:
+        # No OpenAI API key configured
+        return None
+
 # Chat endpoint for text messages
 @router.post("/chat")
 async def chat(
@@ -46,7 +75,10 @@ async def chat(
         query = request.get("message", request.get("query", ""))
         language = request.get("language", "en")
         location = request.get("location")
-        conversation_state = request.get("conversation_state", {})
+        conversation_id = request.get("conversation_id")
+        conversation_state = request.get("conversation_state")
+        if conversation_state is None:
+            conversation_state = conversation_store.get(conversation_id) or {}
         
         if not query:
             return JSONResponse(
@@ -57,6 +89,16 @@ async def chat(
         logger.info(f"Received chat request: {query}")
         logger.info(f"Conversation state: {conversation_state}")
             
+        # Only first-turn queries without a location are cached: the answer to
+        # anything else depends on more than the text
+        query_embedding = None
+        if not conversation_state and not location:
+            query_embedding = await embed_query(query)
+            if query_embedding is not None:
+                cached = get_rag_response_cache(language).get(query_embedding)
+                if cached is not None:
+                    return cached
+
         # Process query through RAG engine
         response = await engine.process_query(
             query=query,
@@ -64,6 +106,12 @@ async def chat(
             location=location,
             conversation_state=conversation_state
         )
+        # The engine updates conversation_state in place; a response that changed
+        # it can't be replayed from the cache
+        if (query_embedding is not None and not conversation_state and isinstance(response, dict)
+                and response.get("action") in CACHEABLE_ACTIONS and "error" not in response):
+            get_rag_response_cache(language).put(query_embedding, response)
+        conversation_store.save(conversation_id, conversation_state)
         
         # Log the response for debugging
         logger.info(f"Response: {response}")
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 import openai
 import translators as ts
 from app.services.woocommerce_service import WooCommerceService
-from app.services.product_service import ProductService
+from app.services.product_service import get_product_service
 from app.services.voice_service import VoiceService
 from app.services.calendar_integration_service import CalendarIntegrationService
 from app.services.shopping_list_service import ShoppingListService
@@ -33,7 +33,7 @@ class RAGEngine:
         
         # Initialize all services
         self.wc_service = WooCommerceService()  # WooCommerce service
-        self.product_service = ProductService()  # Product service with enhanced search
+        self.product_service = get_product_service()  # Shared product service with enhanced search
         self.voice_service = VoiceService()  # Voice recognition service
         self.calendar_service = CalendarIntegrationService()  # Calendar integration
         self.shopping_list_service = ShoppingListService()  # Shopping list management
@@ -0,0 +1,40 @@
+import time
+from typing import Any, Dict, Optional
+
+
+class ConversationStore:
+    """Server-side per-conversation state with a sliding expiry
+
+    Entries expire ``ttl`` seconds after they were last saved. At
+    ``maxsize`` conversations, expired entries are dropped first, then the
+    least recently saved one.
+    """
+
+    def __init__(self, ttl: float = 1800, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[str, tuple] = {}  # conversation_id -> (expires_at, state)
+
+    def get(self, conversation_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not conversation_id:
+            return None
+        entry = self._entries.get(conversation_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def save(self, conversation_id: Optional[str], state: Dict[str, Any]) -> None:
+        if not conversation_id:
+            return
+        now = time.monotonic()
+        if conversation_id not in self._entries and len(self._entries) >= self.maxsize:
+            for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                del self._entries[stale]
+            if len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order and save() re-inserts, so the first is the oldest
+                del self._entries[next(iter(self._entries))]
+        self._entries.pop(conversation_id, None)
+        self._entries[conversation_id] = (now + self.ttl, state)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,6 +2,9 @@ import os
 import json
 import logging
 import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from woocommerce import API
@@ -37,6 +40,17 @@ class EnhancedWooCommerceService:
         self.store_api_url = "https://vogo.family/wp-json/wc/store/v1"
         self.store_api_products_url = f"{self.store_api_url}/products"
         self.store_api_categories_url = f"{self.store_api_url}/products/categories"
+
+        # Shared session for Store API calls so they reuse pooled keep-alive
+        # connections instead of a new TLS handshake each; GETs are retried on
+        # connection errors and gateway failures
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=50, pool_maxsize=50,
+                              max_retries=Retry(total=3, backoff_factor=0.2,
+                                                status_forcelist=(502, 503, 504),
+                                                allowed_methods=("GET",), raise_on_status=False))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Path to store the cached data
         self.kb_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
@@ -150,7 +164,7 @@ class EnhancedWooCommerceService:
                 
                 try:
                     logger.info(f"Making WooCommerce Store API request to: {store_api_url}")
-                    response = requests.get(store_api_url, params=params)
+                    response = self.session.get(store_api_url, params=params)
                     
                     if response.status_code == 200:
                         products = response.json()
@@ -242,7 +256,7 @@ class EnhancedWooCommerceService:
             # Fall back to Store API
             try:
                 store_api_url = f"{self.store_api_url}/products/{product_id}"
-                response = requests.get(store_api_url)
+                response = self.session.get(store_api_url)
                 
                 if response.status_code == 200:
                     return response.json()
@@ -318,7 +332,7 @@ class EnhancedWooCommerceService:
                 if category:
                     params["category"] = category
                 
-                response = requests.get(store_api_url, params=params)
+                response = self.session.get(store_api_url, params=params)
                 
                 if response.status_code == 200:
                     try:
@@ -546,7 +560,7 @@ class EnhancedWooCommerceService:
             # Fall back to Store API
             try:
                 store_api_url = f"{self.store_api_url}/products/categories"
-                response = requests.get(store_api_url, params={"per_page": 100})
+                response = self.session.get(store_api_url, params={"per_page": 100})
                 
                 if response.status_code == 200:
                     categories = response.json()
@@ -976,24 +990,33 @@ class EnhancedWooCommerceService:
     # Shipping Methods
     #
     
-    def get_shipping_methods(self) -> List[Dict[str, Any]]:
+    def get_shipping_methods(self) -> Dict[str, Any]:
         """
         Get available shipping methods
         
         Returns:
-            List of shipping method dictionaries
+            Shipping methods under "methods", or error information if the request failed
         """
         try:
             response = self.wcapi.get("shipping_methods")
             
             if response.status_code == 200:
-                return response.json()
+                return {
+                    "status": "success",
+                    "methods": response.json()
+                }
             else:
                 logger.error(f"Failed to fetch shipping methods: {response.status_code} - {response.text[:200]}")
-                return []
+                return {
+                    "status": "error",
+                    "message": f"Failed to fetch shipping methods: {response.status_code}"
+                }
         except Exception as e:
             logger.error(f"Error fetching shipping methods: {str(e)}")
-            return []
+            return {
+                "status": "error",
+                "message": f"Error fetching shipping methods: {str(e)}"
+            }
     
     def get_shipping_zones(self) -> List[Dict[str, Any]]:
         """
@@ -1018,21 +1041,36 @@ class EnhancedWooCommerceService:
     # Payment Methods
     #
     
-    def get_payment_gateways(self) -> List[Dict[str, Any]]:
+    def get_payment_gateways(self) -> Dict[str, Any]:
         """
         Get available payment gateways
         
         Returns:
-            List of payment gateway dictionaries
+            Payment gateways under "gateways", or error information if the request failed
         """
         try:
             response = self.wcapi.get("payment_gateways")
             
             if response.status_code == 200:
-                return response.json()
+                return {
+                    "status": "success",
+                    "gateways": response.json()
+                }
             else:
                 logger.error(f"Failed to fetch payment gateways: {response.status_code} - {response.text[:200]}")
-                return []
+                return {
+                    "status": "error",
+                    "message": f"Failed to fetch payment gateways: {response.status_code}"
+                }
         except Exception as e:
             logger.error(f"Error fetching payment gateways: {str(e)}")
-            return []
+            return {
+                "status": "error",
+                "message": f"Error fetching payment gateways: {str(e)}"
+            }
+
+
+@lru_cache(maxsize=1)
+def get_enhanced_woocommerce_service() -> EnhancedWooCommerceService:
+    """The process-wide EnhancedWooCommerceService, so its session pool and caches are shared"""
+    return EnhancedWooCommerceService()
@@ -49,7 +49,7 @@ class IntentDetectionService:
                     Extract the following information from user messages:
                     1. primary_intent: One of [browse_products, search_product, order_product, get_location, customer_support, general_query]
                     2. location: Any mentioned Romanian city or shopping mall
-                    3. product_type: The category of products they're interested in [mall_delivery, kids_activities, bio_food, antipasti, pet_care, allergies]
+                    3. product_type: The category of products they're interested in [mall_delivery, kids_activities, bio_food, antipasti, pet_care, allergies], or a list of them if they ask about several
                     4. search_terms: Specific product terms or keywords they're searching for
                     
                     Respond ONLY with a valid JSON object containing these fields. If a field is not found, use null."""
@@ -66,7 +66,7 @@ class IntentDetectionService:
             )
             
             intent_data = json.loads(response.choices[0].message.content)
-            logger.info(f"Detected intent: {intent_data}")
+            logger.info("Detected intent: %s", intent_data)
             return intent_data
         
         except Exception as e:
@@ -92,33 +92,24 @@ class IntentDetectionService:
         products = []
         
         try:
-            # Case 1: If product type is specified, use the corresponding category
-            if product_type and product_type in INTENT_TO_CATEGORY:
-                category_id = INTENT_TO_CATEGORY[product_type]
+            # Case 1: If product types are specified, use the corresponding categories
+            product_types = product_type if isinstance(product_type, list) else [product_type]
+            product_types = [t for t in product_types if isinstance(t, str) and t in INTENT_TO_CATEGORY]
+            if product_types:
+                category_ids = [INTENT_TO_CATEGORY[t] for t in product_types]
                 
                 # Check if we have it in cache first
-                cache_key = f"{product_type}_{location}_{search_terms}"
+                cache_key = f"{'+'.join(product_types)}_{location}_{search_terms}"
                 if cache_key in self.product_cache:
                     return self.product_cache[cache_key]
                 
-                # Get products by category
-                params = {
-                    "category": category_id,
-                    "per_page": 10
-                }
+                # Location and search terms both go into the search filter
+                search = " ".join(str(term) for term in (location, search_terms) if term) or None
                 
-                # Add location filter if specified
-                if location:
-                    params["search"] = location
-                    
-                # Add search terms if specified
-                if search_terms:
-                    params["search"] = f"{params.get('search', '')} {search_terms}".strip()
-                
-                # Make the API request
-                success, response = self.woocommerce_service._make_request("products", params=params)
-                if success and isinstance(response, list):
-                    products = self._format_products(response)
+                # All categories come back from one request
+                result = self.woocommerce_service.get_multi_category(category_ids, search=search, limit=10)
+                if result.get("status") == "success":
+                    products = self._format_products(result["products"])
                     self.product_cache[cache_key] = products
             
             # Case 2: If no specific product type but we have search terms
@@ -1,4 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+try:
+    import ahocorasick
+except ImportError:  # optional; city names are then checked one by one
+    ahocorasick = None
 
 class LocationService:
     def __init__(self):
@@ -61,6 +66,28 @@ class LocationService:
                 "mall": "Shopping City Târgu-Jiu"
             }
         ]
+        self._build_city_matcher()
+
+    def _build_city_matcher(self) -> None:
+        """Precompute the lowercased active city names (and an automaton over them) for find_city_in_text"""
+        self._city_names = [(loc["city"].lower(), loc["city"]) for loc in self.get_active_locations()]
+        self._city_automaton = None
+        if ahocorasick is not None and self._city_names:
+            self._city_automaton = ahocorasick.Automaton()
+            for order, (lowered, city) in enumerate(self._city_names):
+                self._city_automaton.add_word(lowered, (order, city))
+            self._city_automaton.make_automaton()
+
+    def find_city_in_text(self, text: str) -> Optional[str]:
+        """Return the first active city (in configuration order) mentioned in the text, if any"""
+        text = text.lower()
+        if self._city_automaton is not None:
+            hits = [value for _, value in self._city_automaton.iter(text)]
+            return min(hits)[1] if hits else None
+        for lowered, city in self._city_names:
+            if lowered in text:
+                return city
+        return None
     
     def get_active_locations(self) -> List[Dict[str, Any]]:
         """Get all active delivery locations"""
@@ -1,4 +1,5 @@
 from typing import Dict, Any
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -12,6 +13,13 @@ class NotificationService:
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")
         self.from_email = os.getenv("FROM_EMAIL", "noreply@vogo.family")
 
+    def _send(self, msg: MIMEMultipart) -> None:
+        """Deliver a message over SMTP (blocking)"""
+        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+            server.send_message(msg)
+
     async def send_booking_confirmation(self, booking_details: Dict[str, Any]) -> Dict[str, Any]:
         """Send booking confirmation email"""
         try:
@@ -36,10 +44,8 @@ class NotificationService:
 
             msg.attach(MIMEText(body, 'plain'))
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+            # The SMTP exchange blocks, so run it in a worker thread
+            await asyncio.to_thread(self._send, msg)
 
             return {
                 'status': 'success',
@@ -1,16 +1,98 @@
 import os
-from typing import Dict, Any, List
+import asyncio
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from openai import AsyncOpenAI
+import numpy as np
 import logging
 
+from app.services.semantic_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
+# Model used to embed user queries for the semantic response cache
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into batched API calls
+
+    A background task takes the first queued text, then keeps collecting for
+    up to ``window`` seconds (or ``max_batch`` texts) and embeds them all with
+    one request, sending each distinct text once. Each caller's future gets
+    its own vector, or None on error.
+    """
+
+    def __init__(self, client: AsyncOpenAI, max_batch: int = 64, window: float = 0.01):
+        self.client = client
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, text: str) -> Optional[np.ndarray]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # Concurrent requests often carry the same text (e.g. a popular question)
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+                vectors = {texts[item.index]: np.asarray(item.embedding, dtype=np.float32)
+                           for item in response.data}
+            except Exception as e:
+                logger.error(f"Error embedding batch of {len(texts)} texts with OpenAI: {str(e)}")
+                vectors = {}
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(vectors.get(text))
+
+
 class OpenAIService:
     def __init__(self):
         self.api_key = os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not found in environment variables")
         self.client = AsyncOpenAI(api_key=self.api_key)
+        self.embedding_cache = EmbeddingCache(maxsize=10000)
+        # Started on app startup; until then embeddings are requested one at a time
+        self.embedding_batcher = EmbeddingBatcher(self.client)
         
         # System prompt that defines the bot's behavior
         self.system_prompt = """
@@ -124,6 +206,28 @@ class OpenAIService:
         Remember: Be specific with restaurant and mall names rather than using generic placeholders like "Restaurant A" or "Restaurant B".
         """
         
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a piece of text, returning a float32 vector (None if the request fails)"""
+        try:
+            response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+            return np.asarray(response.data[0].embedding, dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Error embedding text with OpenAI: {str(e)}")
+            return None
+
+    async def embed_with_cache(self, text: str) -> Optional[np.ndarray]:
+        """Like embed(), but repeated texts (ignoring case and surrounding whitespace) skip the API call"""
+        key = self.embedding_cache.key(text)
+        vector = self.embedding_cache.get(key)
+        if vector is None:
+            if self.embedding_batcher.running:
+                vector = await self.embedding_batcher.submit(text)
+            else:
+                vector = await self.embed(text)
+            if vector is not None:
+                vector = self.embedding_cache.put(key, vector)
+        return vector
+
     async def get_ai_response(self, user_message: str, chat_history=None, context=None) -> str:
         """
         Get a response from the OpenAI API based on the user's message and context.
@@ -227,3 +331,9 @@ class OpenAIService:
                 "action": None,
                 "services": []
             }
+
+
+@lru_cache(maxsize=1)
+def get_openai_service() -> OpenAIService:
+    """The process-wide OpenAIService, so its embedding cache and batcher are shared"""
+    return OpenAIService()
@@ -1,6 +1,8 @@
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
-from .enhanced_woocommerce_service import EnhancedWooCommerceService
+from .enhanced_woocommerce_service import EnhancedWooCommerceService, get_enhanced_woocommerce_service
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +103,13 @@ class ProductService:
                 "message": f"Error searching products: {str(e)}"
             }
             
+    async def asearch_products(self, query: str, category: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """
+        search_products() run in a worker thread, so several searches can be
+        awaited together with asyncio.gather and share the session's connection pool
+        """
+        return await asyncio.to_thread(self.search_products, query, category, limit)
+
     def _generate_search_summary(self, products: List[Dict[str, Any]], query: str) -> Dict[str, Any]:
         """
         Generate a summary of search result matches for natural language responses
@@ -407,3 +416,9 @@ class ProductService:
                 "status": "error",
                 "message": f"Error fetching on-sale products: {str(e)}"
             }
+
+
+@lru_cache(maxsize=1)
+def get_product_service() -> ProductService:
+    """The process-wide ProductService, backed by the shared EnhancedWooCommerceService"""
+    return ProductService(woocommerce_service=get_enhanced_woocommerce_service())
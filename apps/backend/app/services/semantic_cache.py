@@ -0,0 +1,221 @@
+import os
+import json
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Score every row instead of just the LSH candidates once they are at least
+# this fraction (1/n) of the cache
+DENSE_SCAN_FRACTION = 4
+
+
+class EmbeddingCache:
+    """Exact-match LRU cache of text embeddings
+
+    Keys are the SHA-256 digest of the lowercased, stripped text, so the same
+    question typed twice is only embedded once. Vectors are stored as
+    read-only contiguous float32 arrays and returned without copying.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.sha256(text.lower().strip().encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+        return vector
+
+    def put(self, key: bytes, vector) -> np.ndarray:
+        vector = np.ascontiguousarray(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return vector
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """Approximate cache keyed by query embeddings
+
+    A lookup hits when a stored query's embedding is within ``threshold``
+    cosine distance of the new one, so rephrasings like "mall delivery in
+    Bucharest" / "Bucharest mall delivery" share an entry. Keys are kept as
+    float32 rows of one contiguous matrix, so scoring is a single BLAS
+    matrix-vector product; the least recently used entry is evicted at
+    capacity.
+
+    Candidates are found with random-projection LSH: ``num_tables`` tables,
+    each hashing a vector to the signs of ``num_bits`` random projections.
+    Only rows sharing a bucket with the query in some table are compared
+    exactly, so lookups don't scan the whole cache as it grows.
+
+    With ``ttl`` (seconds), entries older than that are treated as misses and
+    are not reloaded from disk; ages are wall-clock so they survive restarts.
+    """
+
+    def __init__(self, threshold: float = 0.05, capacity: int = 1024,
+                 num_bits: int = 12, num_tables: int = 8, seed: int = 0,
+                 ttl: Optional[float] = None):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl
+        self.num_bits = num_bits
+        self.num_tables = num_tables
+        self.seed = seed
+        self._keys: Optional[np.ndarray] = None  # (capacity, dim) unit vectors
+        self._planes: Optional[np.ndarray] = None  # (num_tables * num_bits, dim)
+        self._tables: List[dict] = [{} for _ in range(num_tables)]
+        self._row_buckets: List[List[bytes]] = []
+        self._values: List[Any] = []
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._stored_at = np.zeros(capacity, dtype=np.float64)  # time.time() of each put
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _reset(self, dim: int) -> None:
+        """Size the key matrix and projections for embeddings of ``dim`` dimensions, dropping all entries"""
+        rng = np.random.default_rng(self.seed)
+        self._planes = rng.standard_normal((self.num_tables * self.num_bits, dim)).astype(np.float32)
+        self._keys = np.zeros((self.capacity, dim), dtype=np.float32)
+        self._tables = [{} for _ in range(self.num_tables)]
+        self._row_buckets = []
+        self._values = []
+        self._last_used[:] = 0
+        self._stored_at[:] = 0
+
+    def _buckets(self, vector: np.ndarray) -> List[bytes]:
+        """The vector's bucket key in each LSH table"""
+        bits = (self._planes @ vector > 0).reshape(self.num_tables, self.num_bits)
+        return [row.tobytes() for row in np.packbits(bits, axis=1)]
+
+    def _candidates(self, buckets: List[bytes]) -> Set[int]:
+        candidates = set()
+        for table, bucket in zip(self._tables, buckets):
+            candidates.update(table.get(bucket, ()))
+        return candidates
+
+    def get(self, embedding) -> Optional[Any]:
+        """Return the value stored for the nearest query, or None if none is close enough"""
+        query = self._normalize(embedding)
+        with self._lock:
+            if not self._values or self._keys.shape[1] != query.shape[0]:
+                return None
+            candidates = self._candidates(self._buckets(query))
+            if not candidates:
+                return None
+            size = len(self._values)
+            if len(candidates) * DENSE_SCAN_FRACTION >= size:
+                # Gathering most of the rows costs more than one matrix-vector
+                # product over the contiguous block, which also scores every row
+                similarities = self._keys[:size] @ query
+                index = int(np.argmax(similarities))
+                similarity = similarities[index]
+            else:
+                rows = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+                similarities = self._keys[rows] @ query
+                best = int(np.argmax(similarities))
+                index, similarity = int(rows[best]), similarities[best]
+            if 1.0 - similarity > self.threshold:
+                return None
+            if self.ttl is not None and time.time() - self._stored_at[index] > self.ttl:
+                # Expired: make it the next row to be evicted
+                self._last_used[index] = 0
+                return None
+            self._clock += 1
+            self._last_used[index] = self._clock
+            return self._values[index]
+
+    def put(self, embedding, value: Any) -> None:
+        """Store a value under a query embedding, evicting the least recently used entry when full"""
+        key = self._normalize(embedding)
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key: np.ndarray, value: Any, last_used: Optional[int] = None,
+             stored_at: Optional[float] = None) -> None:
+        if self._keys is None or self._keys.shape[1] != key.shape[0]:
+            # First entry (or a different embedding model)
+            self._reset(key.shape[0])
+        buckets = self._buckets(key)
+        size = len(self._values)
+        if size < self.capacity:
+            index = size
+            self._values.append(value)
+            self._row_buckets.append(buckets)
+        else:
+            index = int(np.argmin(self._last_used))
+            for table, bucket in zip(self._tables, self._row_buckets[index]):
+                table[bucket].discard(index)
+                if not table[bucket]:
+                    del table[bucket]
+            self._values[index] = value
+            self._row_buckets[index] = buckets
+        for table, bucket in zip(self._tables, buckets):
+            table.setdefault(bucket, set()).add(index)
+        self._keys[index] = key
+        self._stored_at[index] = time.time() if stored_at is None else stored_at
+        if last_used is None:
+            self._clock += 1
+            last_used = self._clock
+        self._last_used[index] = last_used
+
+    def save(self, path: str) -> None:
+        """Write the entries to ``path`` as one .npz (keys, values as JSON, recency, age), replaced atomically"""
+        with self._lock:
+            size = len(self._values)
+            if not size:
+                return
+            tmp_path = f"{path}.tmp.npz"
+            np.savez(tmp_path, keys=self._keys[:size], last_used=self._last_used[:size],
+                     stored_at=self._stored_at[:size], values=np.array(json.dumps(self._values)))
+            os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """Load entries written by save(); the LSH tables are rebuilt from the keys
+
+        Entries already older than ``ttl`` are skipped.
+        """
+        try:
+            with np.load(path) as data:
+                keys, last_used, stored_at = data["keys"], data["last_used"], data["stored_at"]
+                values = json.loads(str(data["values"]))
+        except (OSError, ValueError, KeyError) as e:
+            logger.info(f"No semantic cache loaded from {path}: {str(e)}")
+            return
+        if not (len(keys) == len(last_used) == len(stored_at) == len(values)):
+            logger.warning(f"Ignoring semantic cache {path}: {len(keys)} keys, "
+                           f"{len(last_used)} timestamps and {len(values)} values")
+            return
+        now = time.time()
+        with self._lock:
+            # Oldest first so the most recently used entries survive a smaller capacity
+            for i in np.argsort(last_used):
+                if self.ttl is None or now - stored_at[i] <= self.ttl:
+                    self._put(keys[i], values[i], int(last_used[i]), float(stored_at[i]))
+            self._clock = max(self._clock, int(last_used.max()))
+
+    def __len__(self) -> int:
+        return len(self._values)
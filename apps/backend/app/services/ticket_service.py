@@ -7,6 +7,15 @@ class TicketService:
     def __init__(self):
         self.api_key = os.getenv("TICKET_SYSTEM_API_KEY", "")
         self.api_url = os.getenv("TICKET_SYSTEM_URL", "https://api.vogo.family/tickets")
+        # Shared client so consecutive calls (create, then assign) reuse one connection
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
 
     async def create_ticket(self, booking_details: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new ticket in the ticketing system"""
@@ -32,14 +41,9 @@ class TicketService:
                 }
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    json=ticket_data,
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-                ticket = response.json()
+            response = await self.client.post(self.api_url, json=ticket_data)
+            response.raise_for_status()
+            ticket = response.json()
 
             return {
                 'status': 'success',
@@ -61,14 +65,9 @@ class TicketService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    f"{self.api_url}/{ticket_id}",
-                    json=update_data,
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-                ticket = response.json()
+            response = await self.client.patch(f"{self.api_url}/{ticket_id}", json=update_data)
+            response.raise_for_status()
+            ticket = response.json()
 
             return {
                 'status': 'success',
@@ -1,4 +1,6 @@
 import os
+import shutil
+import asyncio
 import tempfile
 import logging
 from typing import BinaryIO
@@ -6,6 +8,9 @@ from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
+# Read size when copying uploads to disk, so memory use stays bounded
+CHUNK_SIZE = 1 << 20
+
 class WhisperService:
     def __init__(self):
         """Initialize WhisperService with OpenAI API"""
@@ -16,33 +21,34 @@ class WhisperService:
             logger.error(f"Error initializing OpenAI client: {str(e)}")
             raise
 
+    def transcribe_audio_path(self, path: str) -> str:
+        """Transcribe an audio file on disk using OpenAI's Whisper API (blocking)"""
+        with open(path, "rb") as audio:
+            response = self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio,
+                language="en"
+            )
+        return response.text
+
     async def transcribe_audio(self, audio_file: BinaryIO) -> str:
         """Transcribe audio using OpenAI's Whisper API"""
+        temp_path = None
         try:
-            # Create a temporary file to store the audio
+            # Copy the audio to a temporary file in fixed-size chunks
             with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-                temp_file.write(audio_file.read())
                 temp_path = temp_file.name
+                shutil.copyfileobj(audio_file, temp_file, CHUNK_SIZE)
 
-            # Transcribe using OpenAI's Whisper API
-            with open(temp_path, "rb") as audio:
-                response = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio,
-                    language="en"
-                )
-
-            # Clean up the temporary file
-            os.unlink(temp_path)
-            
-            return response.text
+            # The API call blocks, so run it in a worker thread
+            return await asyncio.to_thread(self.transcribe_audio_path, temp_path)
 
         except Exception as e:
             logger.error(f"Error transcribing audio: {str(e)}")
-            # Clean up temporary file if it exists
-            if 'temp_path' in locals():
+            raise
+        finally:
+            if temp_path:
                 try:
                     os.unlink(temp_path)
-                except:
+                except OSError:
                     pass
-            raise
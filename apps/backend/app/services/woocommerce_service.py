@@ -1,11 +1,35 @@
 import os
+import sys
+import gzip
 import json
+import hashlib
+import math
 import time
-import requests
+import threading
+import httpx
 import logging
-from requests_oauthlib import OAuth1
-from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
+from oauthlib.oauth1 import Client as OAuth1Client
+from typing import Dict, Any, Iterator, Optional, Tuple, List
+from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; list responses are then parsed in one go
+    ijson = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional; cuisine matching falls back to substring checks
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +45,16 @@ CATEGORY_PET_CARE_SLUG = "animale-de-companie"
 CATEGORY_KIDS_ACTIVITIES = 228  # ID for educational activities
 CATEGORY_KIDS_ACTIVITIES_SLUG = "copii-educatie-hrana-activitati"
 
+# Food Categories
+CATEGORY_BIO_FOOD = 346  # ID for bio food
+CATEGORY_BIO_FOOD_SLUG = "alimente-bio"
+CATEGORY_ANTIPASTI = 347  # ID for antipasti
+CATEGORY_ANTIPASTI_SLUG = "antipasti-bio"
+
+# Allergies Category
+CATEGORY_ALLERGIES = 548  # ID for allergies
+CATEGORY_ALLERGIES_SLUG = "alergii-2"
+
 # Restaurant Category
 CATEGORY_RESTAURANT = 546  # ID for restaurant category 
 CATEGORY_RESTAURANT_SLUG = "restaurante"
@@ -33,6 +67,10 @@ CATEGORY_PHARMACY_SLUG = "farmacii-non-stop-in-romania"
 CATEGORY_UNCATEGORIZED = 73
 CATEGORY_UNCATEGORIZED_SLUG = "uncategorized"
 
+# WooCommerce caps per_page at 100, larger listings have to be paged
+WC_MAX_PER_PAGE = 100
+PAGE_FETCH_WORKERS = 8  # Max concurrent page requests
+
 # Common locations based on the product data
 LOCATIONS = [
     "Alba Iulia",
@@ -56,6 +94,188 @@ LOCATIONS = [
     # Add more locations from the _available_cities meta field
 ]
 
+# Product fields requested via _fields so listings don't pull meta_data, variations, etc.
+_PRODUCT_MIN_FIELDS = "id,name,description,short_description,price,regular_price,sale_price,images,categories,tags"
+# Service listings also read the slug and the _available_* meta entries
+_SERVICE_FIELDS = _PRODUCT_MIN_FIELDS + ",slug,meta_data"
+
+# Product attribute names that carry a service location
+_LOCATION_ATTR_NAMES = frozenset({"location", "address", "service location"})
+
+# Category-name keywords mapped to cuisines, in priority order
+CUISINE_KEYWORDS = (
+    ("italian", "italian"),
+    ("pizza", "italian"),
+    ("grecesc", "grecesc"),
+    ("spaniol", "spaniol"),
+    ("vegan", "vegan"),
+    ("arabesc", "arabesc"),
+    ("asia", "asia"),  # also covers "asian"
+    ("chinese", "asia"),
+    ("traditional", "traditional"),
+    ("romanian", "traditional"),
+    ("sport", "sport"),
+)
+
+
+def _build_cuisine_automaton():
+    """Compile CUISINE_KEYWORDS into one Aho-Corasick automaton, if pyahocorasick is installed"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (keyword, cuisine) in enumerate(CUISINE_KEYWORDS):
+        automaton.add_word(keyword, (priority, cuisine))
+    automaton.make_automaton()
+    return automaton
+
+_CUISINE_AUTOMATON = _build_cuisine_automaton()
+
+def _detect_cuisine(product: Dict[str, Any]) -> str:
+    """Return the highest-priority cuisine matched by any of the product's categories"""
+    category_names = [category.get("name", "").lower() for category in product.get("categories", [])]
+    if _CUISINE_AUTOMATON is not None:
+        # One pass over all names; keywords never contain a newline, so no match spans two names
+        hits = [value for _, value in _CUISINE_AUTOMATON.iter("\n".join(category_names))]
+        return min(hits)[1] if hits else "traditional"
+    for keyword, cuisine in CUISINE_KEYWORDS:
+        if any(keyword in name for name in category_names):
+            return cuisine
+    return "traditional"
+
+# Fields kept when reshaping products into the compact listing format
+_PRODUCT_FIELDS = itemgetter("id", "name", "description", "price", "images")
+
+
+def _shape_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape a WooCommerce product into the compact listing format"""
+    product_id, name, description, price, images = _PRODUCT_FIELDS(product)
+    return {
+        "id": product_id,
+        "name": name,
+        "description": description,
+        "price": price,
+        "image_url": images[0]["src"] if images else None,
+    }
+
+
+def _json_dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json_file(path: str) -> Any:
+    """Read a JSON file with a single read() and parse the bytes"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return _json_loads(raw)
+
+
+def _first_attribute_options(product: Dict[str, Any]) -> Dict[str, str]:
+    """Map each lowercased attribute name to its first option ("" when it has none)"""
+    return {
+        attribute["name"].lower(): attribute["options"][0] if attribute["options"] else ""
+        for attribute in product.get("attributes", [])
+    }
+
+
+_src = itemgetter("src")
+_name = itemgetter("name")
+
+
+def _image_srcs(product: Dict[str, Any]) -> List[str]:
+    """URLs of a product's images"""
+    return list(map(_src, product.get("images") or ()))
+
+
+def _interned_names(items: List[Dict[str, Any]]) -> List[str]:
+    """Names of categories/tags, interned since the same few repeat across every product"""
+    return list(map(sys.intern, map(_name, items or ())))
+
+
+def _meta_dict(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Index a product's meta_data by key (the first entry wins, as with a linear scan)"""
+    meta = {}
+    for entry in product.get("meta_data") or ():
+        meta.setdefault(entry.get("key"), entry.get("value"))
+    return meta
+
+
+def _format_service(product: Dict[str, Any], location: str, available_cities: Any) -> Dict[str, Any]:
+    """Build the service listing entry shared by the mall, restaurant and pet care lookups"""
+    return {
+        "id": product["id"],
+        "name": product["name"],
+        "slug": product.get("slug", ""),
+        "description": product.get("description", ""),
+        "short_description": product.get("short_description", ""),
+        "price": product.get("price", ""),
+        "regular_price": product.get("regular_price", ""),
+        "sale_price": product.get("sale_price", ""),
+        "images": _image_srcs(product),
+        "categories": _interned_names(product.get("categories")),
+        "tags": _interned_names(product.get("tags")),
+        "location": location,
+        "available_cities": available_cities
+    }
+
+
+class OAuth1Auth(httpx.Auth):
+    """httpx auth flow that signs each request with OAuth1 (HMAC-SHA1)
+
+    Only the URL is signed, matching requests_oauthlib for JSON bodies.
+    """
+
+    def __init__(self, consumer_key: str, consumer_secret: str):
+        self._signer = OAuth1Client(consumer_key, client_secret=consumer_secret)
+
+    def auth_flow(self, request: httpx.Request):
+        _, headers, _ = self._signer.sign(str(request.url), http_method=request.method)
+        request.headers["Authorization"] = headers["Authorization"]
+        yield request
+
+
+class ProductTable:
+    """Indexed view of the products cache
+
+    The filter paths only look products up by id or by category id/slug, so
+    those indexes are built in one pass over the cache instead of walking
+    each product's nested categories on every call.
+    """
+    __slots__ = ("source", "raw", "ids", "by_id", "by_category_id", "by_category_slug")
+
+    def __init__(self, products: List[Dict[str, Any]]):
+        self.source = products
+        self.raw = products if isinstance(products, list) else []
+        self.ids = [p.get("id") for p in self.raw]
+        self.by_id = dict(zip(self.ids, self.raw))
+
+        by_category_id = defaultdict(list)
+        by_category_slug = defaultdict(list)
+        for product in self.raw:
+            for cat in product.get("categories", []):
+                by_category_id[cat.get("id")].append(product)
+                by_category_slug[sys.intern(cat.get("slug") or "")].append(product)
+        self.by_category_id = dict(by_category_id)
+        self.by_category_slug = dict(by_category_slug)
+
+    def filter_by_category(self, category: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return products in the given category (numeric ID or slug)"""
+        try:
+            matches = self.by_category_id.get(int(category), [])
+        except ValueError:
+            matches = self.by_category_slug.get(category, [])
+        return matches[:limit]
+
+
 class WooCommerceService:
     def __init__(self):
         """Initialize the WooCommerce API service"""
@@ -72,7 +292,20 @@ class WooCommerceService:
         logger.info("Using provided API credentials")
         
         # Initialize wcapi attribute for compatibility with code that expects it
-        self.wcapi = None  # No longer using session-based auth
+        self.wcapi = None
+
+        # Shared HTTP/2 client with the OAuth1 signer bound once; concurrent
+        # requests (e.g. page fetches) are multiplexed over one connection,
+        # and failed connection attempts are retried
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            ),
+            auth=OAuth1Auth(self.consumer_key, self.consumer_secret),
+            timeout=10.0
+        )
         
         # Define standard API endpoints with full URLs
         self.endpoints = {
@@ -89,12 +322,16 @@ class WooCommerceService:
         self.cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache")
         os.makedirs(self.cache_dir, exist_ok=True)
         self.cache_expiration = 3600  # 1 hour
+        self._cache_digests = {}  # cache_type -> (digest of last written data, write time)
         
         # Initialize cache
         self.cache = {
             "categories": self._load_cache("categories"),
             "products": self._load_cache("products")
         }
+        self._product_table = None
+        # time.time() when self.cache["products"] was last filled; _load_cache only returns fresh data
+        self._products_cached_at = time.time() if self.cache["products"] else 0.0
         
         # Use a temporary directory for kb to avoid permission issues
         import tempfile
@@ -104,8 +341,26 @@ class WooCommerceService:
         self.kb_path = kb_file
         logger.info(f"Using knowledge base file: {self.kb_path}")
 
+        # Parsed KB file kept in memory so updates don't re-read it from disk
+        self._cache_mem = None
+        self._cache_lock = threading.RLock()
+
+        # Last known KB file mtime (None if missing) and when it was stat'ed
+        self._cache_mtime = None
+        self._cache_mtime_checked_at = 0.0
+
+        # Digest of the bytes last written to the KB file
+        self._kb_digest = None
+
+        # time.monotonic() of the last successful sync/update (None until then)
+        self.last_sync = None
+
     def _get_cache_path(self, cache_type: str) -> str:
-        """Get the path for a specific cache file"""
+        """Get the path for a specific (gzip-compressed) cache file"""
+        return os.path.join(self.cache_dir, f"{cache_type}_cache.json.gz")
+
+    def _get_legacy_cache_path(self, cache_type: str) -> str:
+        """Get the path of the older plaintext cache file, still read as a fallback"""
         return os.path.join(self.cache_dir, f"{cache_type}_cache.json")
         
     def _get_products_authenticated(self, **params) -> List[Dict[str, Any]]:
@@ -123,36 +378,72 @@ class WooCommerceService:
         return []
     
     def _load_cache(self, cache_type: str) -> Dict[str, Any]:
-        """Load cache for a specific type of data"""
+        """Load cache for a specific type of data from disk
+
+        Only reads the cache file; on a miss the data is fetched lazily by
+        the first get_* call so constructing the service never hits the API.
+        """
         cache_path = self._get_cache_path(cache_type)
+        legacy_path = self._get_legacy_cache_path(cache_type)
         try:
+            cache = None
             if os.path.exists(cache_path):
-                with open(cache_path, 'r') as f:
-                    cache = json.load(f)
-                if time.time() - cache.get('timestamp', 0) < self.cache_expiration:
-                    return cache.get('data', {})
+                with gzip.open(cache_path, 'rb') as f:
+                    cache = _json_loads(f.read())
+            elif os.path.exists(legacy_path):
+                cache = _read_json_file(legacy_path)
+            if cache and time.time() - cache.get('timestamp', 0) < self.cache_expiration:
+                return cache.get('data', {})
         except Exception as e:
             logger.error(f"Error loading {cache_type} cache: {str(e)}")
-        # Try to sync data from API
-        success, data = self._make_request(cache_type)
-        if success:
-            self._save_cache(cache_type, data)
-            return data
         return {}
     
     def _save_cache(self, cache_type: str, data: Dict[str, Any]):
-        """Save cache for a specific type of data"""
+        """Save cache for a specific type of data
+
+        The file is written to a temp path and swapped in with os.replace so a
+        crash mid-write can't leave a corrupt cache behind. Unchanged data is
+        not rewritten until its timestamp needs refreshing.
+        """
         cache_path = self._get_cache_path(cache_type)
         try:
-            cache = {
-                'timestamp': time.time(),
-                'data': data
-            }
-            with open(cache_path, 'w') as f:
-                json.dump(cache, f)
+            payload = _json_dumps(data)
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            now = time.time()
+            last_digest, written_at = self._cache_digests.get(cache_type, (None, 0))
+            if digest == last_digest and now - written_at < self.cache_expiration / 2:
+                return
+
+            tmp_path = f"{cache_path}.tmp"
+            # Level 1 keeps compression cheap; the JSON still shrinks several times over
+            with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                f.write(b'{"timestamp": %r, "data": %s}' % (now, payload))
+            os.replace(tmp_path, cache_path)
+            self._cache_digests[cache_type] = (digest, now)
         except Exception as e:
             logger.error(f"Error saving {cache_type} cache: {str(e)}")
             
+    def _get_product_table(self) -> ProductTable:
+        """Get the indexed view of the products cache, rebuilding it when the cache changes
+
+        self.cache["products"] is filled by sync_data and by full-catalogue
+        get_products fetches (via _update_cache_with_products).
+        """
+        products = self.cache["products"]
+        if self._product_table is None or self._product_table.source is not products:
+            self._product_table = ProductTable(products)
+        return self._product_table
+
+    def warm_up(self) -> None:
+        """Do the work the first request would otherwise pay for
+
+        Parses the KB file, builds the product table and opens a keep-alive
+        connection to the API.
+        """
+        self._load_from_cache()
+        self._get_product_table()
+        self._make_request("products/categories", params={"per_page": 1, "_fields": "id"})
+
     def _get_cached_data(self) -> Optional[Dict[str, Any]]:
         """Get all cached data"""
         try:
@@ -166,52 +457,122 @@ class WooCommerceService:
             logger.error(f"Error getting cached data: {str(e)}")
             return None
     
-    def _make_request(self, endpoint: str, method: str = 'GET', params: Dict = None) -> Tuple[bool, Any]:
-        """Make an authenticated request to the WooCommerce API"""
+    def _build_url(self, endpoint: str) -> str:
+        """Resolve an endpoint name or path to a full API URL"""
         # Check if endpoint is a full URL or just a path
         if endpoint.startswith('http'):
-            url = endpoint
-        else:
-            # If it's a known endpoint, use the predefined URL
-            if endpoint in self.endpoints:
-                url = self.endpoints[endpoint]
-            else:
-                # Otherwise, construct the URL from the API base URL
-                url = f"{self.api_url}{endpoint.lstrip('/')}"
+            return endpoint
+        # If it's a known endpoint, use the predefined URL
+        if endpoint in self.endpoints:
+            return self.endpoints[endpoint]
+        # Otherwise, construct the URL from the API base URL
+        return f"{self.api_url}{endpoint.lstrip('/')}"
+
+    def _make_request(self, endpoint: str, method: str = 'GET', params: Dict = None,
+                      return_headers: bool = False) -> Tuple:
+        """Make an authenticated request to the WooCommerce API
+
+        When return_headers is set, the response headers are returned as a
+        third element so callers can read pagination info (X-WP-TotalPages).
+        """
+        url = self._build_url(endpoint)
         
         try:
             logger.info(f"Making {method} request to {url} with params: {params}")
             
-            # Create OAuth1 auth object
-            auth = OAuth1(self.consumer_key, self.consumer_secret)
-            
             if method == 'GET':
-                response = requests.get(url, params=params, auth=auth)
+                response = self.client.get(url, params=params)
             elif method == 'POST':
-                response = requests.post(url, json=params, auth=auth)
+                response = self.client.post(url, json=params)
             elif method == 'PUT':
-                response = requests.put(url, json=params, auth=auth)
+                response = self.client.put(url, json=params)
             elif method == 'DELETE':
-                response = requests.delete(url, auth=auth)
+                response = self.client.delete(url)
             else:
+                if return_headers:
+                    return False, f"Unsupported method: {method}", {}
                 return False, f"Unsupported method: {method}"
-            
+
             response.raise_for_status()
             data = response.json()
             logger.info(f"API response status: {response.status_code}")
+            if return_headers:
+                return True, data, response.headers
             return True, data
         except Exception as e:
             logger.error(f"API request failed: {str(e)}")
+            if return_headers:
+                return False, str(e), {}
             return False, str(e)
-    
+
+    def _iter_items(self, endpoint: str, params: Dict = None) -> Iterator[Dict[str, Any]]:
+        """Yield the items of a list endpoint one at a time
+
+        With ijson installed the response body is decoded incrementally as it
+        arrives, so the full JSON document is never held in memory at once.
+        Request errors are raised to the caller.
+        """
+        if ijson is None:
+            success, data = self._make_request(endpoint, params=params)
+            if not success:
+                raise RuntimeError(data)
+            yield from data if isinstance(data, list) else []
+            return
+
+        url = self._build_url(endpoint)
+        logger.info(f"Streaming GET request to {url} with params: {params}")
+        with self.client.stream("GET", url, params=params) as response:
+            response.raise_for_status()
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, "item", use_float=True)
+            for chunk in response.iter_bytes():
+                parser.send(chunk)
+                yield from items
+                del items[:]
+            parser.close()
+            yield from items
+
+    def _get_category_id(self, slug: str) -> Optional[int]:
+        """Look up a category ID by slug in the categories cache"""
+        for category in self._ensure_categories():
+            if category.get("slug") == slug:
+                return category.get("id")
+        return None
+
+    def _fetch_pages(self, endpoint: str, params: Dict, pages: List[int]) -> List[Dict[str, Any]]:
+        """Fetch the given result pages concurrently and concatenate them in page order
+
+        Raises RuntimeError if any page fails, so callers never cache a
+        listing with pages missing from the middle.
+        """
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            success, data = self._make_request(endpoint, params={**params, "page": page})
+            if success and isinstance(data, list):
+                return data
+            raise RuntimeError(f"Failed to fetch page {page} of {endpoint}: {data}")
+
+        with ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, len(pages))) as executor:
+            results = list(executor.map(fetch_page, pages))
+        return [item for page_items in results for item in page_items]
+
+    def _ensure_categories(self) -> List[Dict[str, Any]]:
+        """Populate the categories cache from the API on first use"""
+        if not self.cache["categories"]:
+            success, data = self._make_request('categories')
+            if success:
+                self._save_cache("categories", data)
+                self.cache["categories"] = data
+        return self.cache["categories"] or []
+
     def get_categories(self, use_cache: bool = True) -> List[Dict[str, Any]]:
         """Get all product categories"""
-        if use_cache and self.cache["categories"]:
-            return self.cache["categories"]
+        if use_cache:
+            return self._ensure_categories()
         
         success, data = self._make_request('categories')
         if success:
             self._save_cache("categories", data)
+            self.cache["categories"] = data
             return data
         return []
     
@@ -221,7 +582,8 @@ class WooCommerceService:
             params = {
                 "category": CATEGORY_KIDS_ACTIVITIES,
                 "per_page": 100,
-                "status": "publish"
+                "status": "publish",
+                "_fields": _PRODUCT_MIN_FIELDS
             }
 
             if location:
@@ -232,13 +594,7 @@ class WooCommerceService:
                 return {"status": "error", "message": products}
 
             activities = [
-                {
-                    "id": product["id"],
-                    "name": product["name"],
-                    "description": product["description"],
-                    "price": product["price"],
-                    "image_url": product["images"][0]["src"] if product["images"] else None,
-                }
+                _shape_product(product)
                 for product in products
                 if self._is_kids_activity(product)
             ]
@@ -258,7 +614,8 @@ class WooCommerceService:
             params = {
                 "category": CATEGORY_BIO_FOOD,
                 "per_page": 100,
-                "status": "publish"
+                "status": "publish",
+                "_fields": _PRODUCT_MIN_FIELDS
             }
 
             if location:
@@ -269,13 +626,7 @@ class WooCommerceService:
                 return {"status": "error", "message": products}
 
             food_items = [
-                {
-                    "id": product["id"],
-                    "name": product["name"],
-                    "description": product["description"],
-                    "price": product["price"],
-                    "image_url": product["images"][0]["src"] if product["images"] else None,
-                }
+                _shape_product(product)
                 for product in products
                 if self._is_bio_food(product)
             ]
@@ -295,7 +646,8 @@ class WooCommerceService:
             params = {
                 "category": CATEGORY_ANTIPASTI,
                 "per_page": 100,
-                "status": "publish"
+                "status": "publish",
+                "_fields": _PRODUCT_MIN_FIELDS
             }
 
             if location:
@@ -306,13 +658,7 @@ class WooCommerceService:
                 return {"status": "error", "message": products}
 
             antipasti_items = [
-                {
-                    "id": product["id"],
-                    "name": product["name"],
-                    "description": product["description"],
-                    "price": product["price"],
-                    "image_url": product["images"][0]["src"] if product["images"] else None,
-                }
+                _shape_product(product)
                 for product in products
                 if self._is_antipasti(product)
             ]
@@ -332,7 +678,8 @@ class WooCommerceService:
             params = {
                 "category": CATEGORY_PET_CARE,
                 "per_page": 100,
-                "status": "publish"
+                "status": "publish",
+                "_fields": _PRODUCT_MIN_FIELDS
             }
 
             if location:
@@ -343,13 +690,7 @@ class WooCommerceService:
                 return {"status": "error", "message": products}
 
             pet_items = [
-                {
-                    "id": product["id"],
-                    "name": product["name"],
-                    "description": product["description"],
-                    "price": product["price"],
-                    "image_url": product["images"][0]["src"] if product["images"] else None,
-                }
+                _shape_product(product)
                 for product in products
                 if self._is_pet_care(product)
             ]
@@ -369,7 +710,8 @@ class WooCommerceService:
             params = {
                 "category": CATEGORY_ALLERGIES,
                 "per_page": 100,
-                "status": "publish"
+                "status": "publish",
+                "_fields": _PRODUCT_MIN_FIELDS
             }
 
             if location:
@@ -380,13 +722,7 @@ class WooCommerceService:
                 return {"status": "error", "message": products}
 
             allergy_items = [
-                {
-                    "id": product["id"],
-                    "name": product["name"],
-                    "description": product["description"],
-                    "price": product["price"],
-                    "image_url": product["images"][0]["src"] if product["images"] else None,
-                }
+                _shape_product(product)
                 for product in products
                 if self._is_allergy(product)
             ]
@@ -399,47 +735,57 @@ class WooCommerceService:
         except Exception as e:
             logger.error(f"Error fetching allergy products: {str(e)}")
             return {"status": "error", "message": str(e)}
-            
-            if location:
-                params["search"] = location  # Use search parameter for location filtering
-            
-            # Make request to WooCommerce API
-            success, products = self._make_request('products', params=params)
-            
-            if success:
-                restaurants = []
-                
-                for item in products:
-                    # Filter by location in product name if location is specified
-                    if location and location.lower() not in item.get("name", "").lower():
-                        continue
-                        
-                    restaurants.append({
-                        "id": item["id"],
-                        "name": item["name"],
-                        "description": item.get("description", ""),
-                        "short_description": item.get("short_description", ""),
-                        "price": item.get("price", ""),
-                        "regular_price": item.get("regular_price", ""),
-                        "sale_price": item.get("sale_price", ""),
-                        "images": [img["src"] for img in item.get("images", [])],
-                        "categories": [cat["name"] for cat in item.get("categories", [])],
-                        "tags": [tag["name"] for tag in item.get("tags", [])],
-                        "location": location or "All locations"
-                    })
-                
-                logger.info(f"Found {len(restaurants)} restaurants{' for ' + location if location else ''}")
-                return {"status": "success", "restaurants": restaurants}
-            else:
-                error_msg = f"Failed to fetch restaurants: {response.status_code}"
-                logger.error(error_msg)
-                return {"status": "error", "message": error_msg}
-                
+
+    def get_multi_category(self, category_ids: List[int], search: Optional[str] = None,
+                           limit: Optional[int] = None) -> Dict[str, Any]:
+        """Get products in any of several categories with a single request
+
+        WooCommerce accepts a comma-separated list of category IDs, so the
+        union is fetched in one call instead of one call per category. With
+        ``limit``, each category contributes at most ``limit`` products, so one
+        large category can't crowd the others out of the union.
+
+        Returns:
+            {"status": "success", "products": [raw products]}
+        """
+        try:
+            params = {
+                "category": ",".join(str(category_id) for category_id in category_ids),
+                # The server can't cap a union per category, so fetch a full page
+                # and cap locally unless there is only one category
+                "per_page": limit if limit and len(category_ids) == 1 else WC_MAX_PER_PAGE,
+                "status": "publish",
+                "_fields": _PRODUCT_MIN_FIELDS
+            }
+
+            if search:
+                params["search"] = search
+
+            success, products = self._make_request("products", method="GET", params=params)
+            if not success or not isinstance(products, list):
+                return {"status": "error", "message": products}
+
+            if limit is not None:
+                counts = dict.fromkeys(category_ids, 0)
+                capped = []
+                for product in products:
+                    targets = [cat.get("id") for cat in product.get("categories", [])
+                               if counts.get(cat.get("id"), limit) < limit]
+                    if targets:
+                        capped.append(product)
+                        for category_id in targets:
+                            counts[category_id] += 1
+                products = capped
+
+            return {
+                "status": "success",
+                "products": products
+            }
+
         except Exception as e:
-            error_msg = f"Error getting restaurants: {str(e)}"
-            logger.error(error_msg)
-            return {"status": "error", "message": error_msg}
-    
+            logger.error(f"Error fetching products for categories {category_ids}: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
     def _is_kids_activity(self, product: Dict[str, Any]) -> bool:
         """Check if a product is a kids activity"""
         category_ids = [cat.get("id") for cat in product.get("categories", [])]
@@ -474,7 +820,8 @@ class WooCommerceService:
         """Get mall delivery services, optionally filtered by location"""
         params = {
             "category": CATEGORY_MALL_DELIVERY,
-            "per_page": 100
+            "per_page": 100,
+            "_fields": _PRODUCT_MIN_FIELDS
         }
         
         if location:
@@ -489,9 +836,9 @@ class WooCommerceService:
                 "description": item.get("description", ""),
                 "short_description": item.get("short_description", ""),
                 "price": item.get("price", ""),
-                "images": [img["src"] for img in item.get("images", [])],
-                "categories": [cat["name"] for cat in item.get("categories", [])],
-                "tags": [tag["name"] for tag in item.get("tags", [])]
+                "images": _image_srcs(item),
+                "categories": _interned_names(item.get("categories")),
+                "tags": _interned_names(item.get("tags"))
             } for item in products if self._is_mall_service(item)]
             
             return {
@@ -545,86 +892,17 @@ class WooCommerceService:
     def _cache_data(self, data: Dict[str, Any]) -> None:
         """Cache the data to disk"""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.kb_path), exist_ok=True)
-            
             # Add timestamp to the data
             data['timestamp'] = time.time()
             
-            # Write to file
-            with open(self.kb_path, 'w') as f:
-                json.dump(data, f)
+            with self._cache_lock:
+                self._atomic_write_cache(data, indent=False)
+                self._cache_mem = data
                 
             logger.info(f"Cached WooCommerce data to {self.kb_path}")
         except Exception as e:
             logger.error(f"Error caching data: {str(e)}")
     
-    def get_products(self, category: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get products from WooCommerce API
-        
-        Args:
-            category: Optional category filter
-            limit: Maximum number of products to return
-            
-        Returns:
-            List of product dictionaries
-        """
-        try:
-            # Check if we have a valid cache that's not expired
-            cached_data = self._get_cached_data()
-            if cached_data and not self._is_cache_expired(cached_data) and 'products' in cached_data:
-                products = cached_data['products']
-                
-                # Filter by category if specified
-                if category and products:
-                    # Check if category is a numeric ID or a slug
-                    try:
-                        category_id = int(category)
-                        products = [p for p in products if any(cat.get('id') == category_id for cat in p.get('categories', []))]
-                    except ValueError:
-                        # If not a numeric ID, treat as a slug
-                        products = [p for p in products if any(cat.get('slug') == category for cat in p.get('categories', []))]
-                
-                logger.info(f"Using cached products data ({len(products)} products)")
-                return products[:limit]
-            
-            # Use the authenticated API
-            params = {
-                "per_page": limit,
-                "status": "publish"
-            }
-            
-            # Add category filter if specified
-            if category:
-                # Try to determine if it's a numeric ID or a slug
-                try:
-                    int(category)  # Will raise ValueError if not a number
-                    params["category"] = category
-                except ValueError:
-                    # Find category ID by slug
-                    success, categories = self._make_request("products/categories")
-                    if success:
-                        for cat in categories:
-                            if cat.get("slug") == category:
-                                params["category"] = cat.get("id")
-                                break
-                    else:
-                        # If can't find category ID, use slug in search
-                        params["search"] = category
-                        
-            success, data = self._make_request("products", params=params)
-            if success and isinstance(data, list):
-                # Cache the products for future use
-                self._update_cache_with_products(data)
-                return data[:limit]
-            
-            logger.warning(f"Failed to fetch products: {data}")
-            return []
-
-        except Exception as e:
-            logger.error(f"Error in get_products: {str(e)}")
-            return []
-
     def get_product_categories(self) -> List[Dict[str, Any]]:
         """
         Get product categories from WooCommerce API
@@ -708,21 +986,16 @@ class WooCommerceService:
             Product data or None if not found
         """
         try:
-            # Check if we have cached data
-            cached_data = self._get_cached_data()
-            if cached_data and "products" in cached_data:
-                for product in cached_data["products"]:
-                    if product.get("id") == product_id:
-                        return product
+            # Check the cached products via the id index
+            product = self._get_product_table().by_id.get(product_id)
+            if product is not None:
+                return product
             
             # Not found in cache, fetch from API
-            response = self.wcapi.get(f"products/{product_id}")
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to fetch product {product_id}: {response.status_code} - {response.text}")
-                return None
+            product = self.get_product(product_id)
+            if product is None:
+                logger.error(f"Failed to fetch product {product_id}")
+            return product
         except Exception as e:
             logger.error(f"Error fetching product {product_id}: {str(e)}")
             return None
@@ -773,7 +1046,7 @@ class WooCommerceService:
         for product in products:
             # Check if this product has location attributes
             for attribute in product.get("attributes", []):
-                if attribute["name"].lower() in ["location", "address", "service location"]:
+                if attribute["name"].lower() in _LOCATION_ATTR_NAMES:
                     locations.append({
                         "id": f"location_{product['id']}",
                         "name": product["name"],
@@ -794,19 +1067,29 @@ class WooCommerceService:
             True if sync was successful, False otherwise
         """
         # Check if we need to sync
-        if not force and self.last_sync and (datetime.now() - self.last_sync).total_seconds() < self.cache_expiration:
+        if not force and self.last_sync and (time.monotonic() - self.last_sync) < self.cache_expiration:
             return True
         
         try:
-            # Get food delivery products (assuming they're in the food-delivery category)
-            food_products = self.get_products(category="food-delivery")
+            # Stream food delivery products (assuming they're in the food-delivery
+            # category) so each one is transformed as it is decoded
+            params = {"per_page": WC_MAX_PER_PAGE, "status": "publish"}
+            food_category_id = self._get_category_id("food-delivery")
+            food_products = iter(())
+            if food_category_id:
+                food_products = self._iter_items("products", {**params, "category": food_category_id})
             
             # If no specific category exists, get all products
-            if not food_products:
-                food_products = self.get_products()
+            first_product = next(food_products, None)
+            if first_product is None:
+                food_products = self._iter_items("products", params)
+            else:
+                food_products = chain([first_product], food_products)
             
-            # Transform products into the format expected by the RAG engine
+            # Transform products into the format expected by the RAG engine,
+            # noting each cuisine's first non-empty image in the same pass
             restaurants = []
+            cuisine_first_image: Dict[str, str] = {}
             
             for product in food_products:
                 # Extract specialties from tags or categories
@@ -815,40 +1098,13 @@ class WooCommerceService:
                     specialties.append(tag["name"])
                 
                 # Extract location from attributes
-                location = "Online"
-                contact = ""
-                hours = ""
-                
-                for attribute in product.get("attributes", []):
-                    if attribute["name"].lower() == "location":
-                        location = attribute["options"][0] if attribute["options"] else "Online"
-                    elif attribute["name"].lower() == "contact":
-                        contact = attribute["options"][0] if attribute["options"] else ""
-                    elif attribute["name"].lower() == "hours":
-                        hours = attribute["options"][0] if attribute["options"] else ""
+                attributes = _first_attribute_options(product)
+                location = attributes.get("location") or "Online"
+                contact = attributes.get("contact", "")
+                hours = attributes.get("hours", "")
                 
                 # Extract cuisine type from categories
-                cuisine = "traditional"
-                for category in product.get("categories", []):
-                    category_name = category.get("name", "").lower()
-                    if "italian" in category_name or "pizza" in category_name:
-                        cuisine = "italian"
-                    elif "grecesc" in category_name:
-                        cuisine = "grecesc"
-                    elif "spaniol" in category_name:
-                        cuisine = "spaniol"
-                    elif "vegan" in category_name:
-                        cuisine = "vegan"
-                    elif "arabesc" in category_name:
-                        cuisine = "arabesc"
-                    elif "asia" in category_name or "asian" in category_name or "chinese" in category_name:
-                        cuisine = "asia"
-                    elif "traditional" in category_name or "romanian" in category_name:
-                        cuisine = "traditional"
-                    elif "sport" in category_name:
-                        cuisine = "sport"
-                    elif "pizza" in category_name:
-                        cuisine = "pizza"
+                cuisine = _detect_cuisine(product)
                 
                 restaurant = {
                     "id": str(product['id']),
@@ -864,17 +1120,19 @@ class WooCommerceService:
                 }
                 
                 restaurants.append(restaurant)
-            
+
+                if not cuisine_first_image.get(cuisine):
+                    cuisine_first_image[cuisine] = restaurant["image"]
+
             # Get cuisine categories from products
-            cuisine_categories = {}
-            for restaurant in restaurants:
-                cuisine = restaurant.get("cuisine")
-                if cuisine and cuisine not in cuisine_categories:
-                    cuisine_categories[cuisine] = {
-                        "name": cuisine.capitalize(),
-                        "description": f"{cuisine.capitalize()} cuisine from local restaurants",
-                        "image": next((r["image"] for r in restaurants if r.get("cuisine") == cuisine and r.get("image")), "")
-                    }
+            cuisine_categories = {
+                cuisine: {
+                    "name": cuisine.capitalize(),
+                    "description": f"{cuisine.capitalize()} cuisine from local restaurants",
+                    "image": image
+                }
+                for cuisine, image in cuisine_first_image.items()
+            }
             
             # Get delivery information
             delivery_info = {
@@ -897,10 +1155,11 @@ class WooCommerceService:
                 "delivery_info": delivery_info
             }
 
-            with open(self.kb_path, 'w') as f:
-                json.dump(kb_data, f, indent=2)
+            with self._cache_lock:
+                self._atomic_write_cache(kb_data)
+                self._cache_mem = kb_data
 
-            self.last_sync = datetime.now().timestamp()
+            self.last_sync = time.monotonic()
 
             return True
 
@@ -908,77 +1167,161 @@ class WooCommerceService:
             logger.error(f"Error syncing knowledge base: {e}")
             return False
 
+    def _mark_cache_written(self) -> None:
+        """Record that the KB file was just written, so its mtime needn't be stat'ed"""
+        self._cache_mtime = self._cache_mtime_checked_at = time.time()
+
     def _should_use_cache(self) -> bool:
         """Check if we should use cached data based on last sync time"""
         try:
-            # If the cache file doesn't exist, we can't use it
-            if not os.path.exists(self.kb_path):
-                return False
-                
-            # Check when the file was last modified
-            file_mod_time = os.path.getmtime(self.kb_path)
             current_time = time.time()
+
+            # Re-stat the file at most once a second
+            if current_time - self._cache_mtime_checked_at >= 1.0:
+                # If the cache file doesn't exist, we can't use it
+                try:
+                    self._cache_mtime = os.path.getmtime(self.kb_path)
+                except FileNotFoundError:
+                    self._cache_mtime = None
+                self._cache_mtime_checked_at = current_time
+
+            if self._cache_mtime is None:
+                return False
             
             # If it's been less than cache_expiration seconds, use the cache
-            return (current_time - file_mod_time) < self.cache_expiration
+            return (current_time - self._cache_mtime) < self.cache_expiration
         except Exception as e:
             logger.error(f"Error checking cache: {str(e)}")
             return False
     
     def _load_from_cache(self) -> Dict[str, Any]:
-        """Load data from cache file"""
-        try:
-            if os.path.exists(self.kb_path):
-                with open(self.kb_path, 'r') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Error loading from cache: {str(e)}")
-            return {}
+        """Load data from cache file
+
+        The file is parsed once and the dict kept in memory; updates modify
+        it in place and _flush_cache writes it back.
+        """
+        with self._cache_lock:
+            if self._cache_mem is None:
+                try:
+                    self._cache_mem = _read_json_file(self.kb_path) if os.path.exists(self.kb_path) else {}
+                except Exception as e:
+                    logger.error(f"Error loading from cache: {str(e)}")
+                    return {}
+            return self._cache_mem
+
+    def _flush_cache(self) -> None:
+        """Write the in-memory cache data to the cache file"""
+        with self._cache_lock:
+            if self._cache_mem is None:
+                return
+
+            self._atomic_write_cache(self._cache_mem)
+
+    def _atomic_write_cache(self, data: Dict[str, Any], indent: bool = True) -> None:
+        """Write data to the KB file via a temp file and os.replace
+
+        If the encoded bytes match what was last written, the file is only
+        touched so its mtime still reflects the sync.
+        """
+        payload = _json_dumps(data, indent=indent)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        with self._cache_lock:
+            if digest == self._kb_digest and os.path.exists(self.kb_path):
+                os.utime(self.kb_path)
+            else:
+                # Ensure the directory exists
+                os.makedirs(os.path.dirname(self.kb_path), exist_ok=True)
+                tmp_path = f"{self.kb_path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.kb_path)
+                self._kb_digest = digest
+            self._mark_cache_written()
     
-    def _update_cache_with_products(self, products: List[Dict[str, Any]]) -> None:
-        """Update cache with new products data"""
+    def _update_cache_with_products(self, products: List[Dict[str, Any]], flush: bool = True) -> None:
+        """Update cache with new products data
+
+        Pass flush=False to batch several updates into one write via _flush_cache.
+        """
         try:
-            # Load existing cache
-            cached_data = self._load_from_cache()
-            
-            # Update products
-            cached_data['products'] = products
-            cached_data['last_updated'] = datetime.now().isoformat()
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(self.kb_path), exist_ok=True)
-            
-            # Write to file
-            with open(self.kb_path, 'w') as f:
-                json.dump(cached_data, f, indent=2)
+            with self._cache_lock:
+                # Update products in the in-memory cache
+                cached_data = self._load_from_cache()
+                cached_data['products'] = products
+                cached_data['last_updated'] = datetime.now().isoformat()
+
+                if flush:
+                    self._flush_cache()
+
+            # Keep the products cache (and so the ProductTable index) in step with the KB
+            self._set_products_cache(products)
                 
             # Update last sync time
-            self.last_sync = time.time()
+            self.last_sync = time.monotonic()
         except Exception as e:
             logger.error(f"Error updating cache with products: {str(e)}")
     
-    def _update_cache_with_categories(self, categories: List[Dict[str, Any]]) -> None:
-        """Update cache with new categories data"""
+    def _set_products_cache(self, products: List[Dict[str, Any]]) -> None:
+        """Replace self.cache["products"] and its on-disk copy; the ProductTable is rebuilt on next use"""
+        self.cache["products"] = products
+        self._products_cached_at = time.time()
+        self._save_cache("products", products)
+
+    def _update_cache_with_categories(self, categories: List[Dict[str, Any]], flush: bool = True) -> None:
+        """Update cache with new categories data
+
+        Pass flush=False to batch several updates into one write via _flush_cache.
+        """
         try:
-            # Load existing cache
-            cached_data = self._load_from_cache()
-            
-            # Update categories
-            cached_data['categories'] = categories
-            cached_data['last_updated'] = datetime.now().isoformat()
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(self.kb_path), exist_ok=True)
-            
-            # Write to file
-            with open(self.kb_path, 'w') as f:
-                json.dump(cached_data, f, indent=2)
+            with self._cache_lock:
+                # Update categories in the in-memory cache
+                cached_data = self._load_from_cache()
+                cached_data['categories'] = categories
+                cached_data['last_updated'] = datetime.now().isoformat()
+
+                if flush:
+                    self._flush_cache()
                 
-            self.last_sync = time.time()
+            self.last_sync = time.monotonic()
         except Exception as e:
             logger.error(f"Error updating cache with categories: {str(e)}")
     
+    def _fetch_all(self, endpoint: str, params: Dict) -> Tuple[List[Dict[str, Any]], Any]:
+        """Fetch every page of a list endpoint, returning the items and page 1's headers
+
+        Pages after the first (per X-WP-TotalPages) are fetched concurrently.
+        Raises RuntimeError if any page fails.
+        """
+        success, data, headers = self._make_request(endpoint, params=params, return_headers=True)
+        if not success or not isinstance(data, list):
+            raise RuntimeError(f"Failed to fetch {endpoint}: {data}")
+
+        total_pages = int(headers.get("X-WP-TotalPages") or 1)
+        if total_pages > 1:
+            data.extend(self._fetch_pages(endpoint, params, list(range(2, total_pages + 1))))
+        return data, headers
+
+    def _count_products(self, params: Dict) -> Optional[int]:
+        """Number of products matching params (X-WP-Total of a one-item page), or None on failure"""
+        success, _, headers = self._make_request(
+            "products", params={**params, "per_page": 1, "_fields": "id"}, return_headers=True
+        )
+        total = headers.get("X-WP-Total") if success else None
+        return int(total) if total is not None else None
+
+    def _products_unchanged(self, marker: Optional[Dict[str, Any]]) -> bool:
+        """Whether the product catalogue is unchanged since the sync recorded in marker
+
+        Checks the whole catalogue rather than one page: the product count
+        catches additions and deletions, and a modified_after query catches
+        edits on any page.
+        """
+        if not marker:
+            return False
+        if self._count_products({}) != marker.get("total"):
+            return False
+        return self._count_products({"modified_after": marker["synced_at"], "dates_are_gmt": "true"}) == 0
+
     def sync_data(self, force: bool = False) -> bool:
         """
         Sync data from WooCommerce API to local cache
@@ -995,24 +1338,37 @@ class WooCommerceService:
                 logger.info("Using cached data (still valid)")
                 return True
             
-            # Get products using _make_request
-            logger.info("Fetching products...")
-            success, products = self._make_request('products', params={"per_page": 100})
-            if not success:
-                logger.error(f"Failed to fetch products: {products}")
-                return False
-            self._update_cache_with_products(products)
-            
-            # Get categories using _make_request
-            logger.info("Fetching categories...")
-            success, categories = self._make_request('categories')
-            if not success:
-                logger.error(f"Failed to fetch categories: {categories}")
-                return False
-            self._update_cache_with_categories(categories)
+            # Fetch categories while checking whether the product catalogue changed
+            # since the last sync; products are only downloaded when it did. Any
+            # failed page raises, so nothing is written unless every page arrived.
+            logger.info("Fetching products and categories...")
+            params = {"per_page": WC_MAX_PER_PAGE}
+            sync_started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            cached_data = self._load_from_cache()
+            marker = cached_data.get("products_marker") if "products" in cached_data else None
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                categories_future = executor.submit(self._fetch_all, 'categories', params)
+                if self._products_unchanged(marker):
+                    logger.info("WooCommerce products not modified, keeping cached products")
+                    products = None
+                    self._set_products_cache(cached_data["products"])
+                else:
+                    products, products_headers = self._fetch_all('products', params)
+                categories, _ = categories_future.result()
+
+            # Write both updates (and the catalogue marker) to disk in one go
+            with self._cache_lock:
+                if products is not None:
+                    self._update_cache_with_products(products, flush=False)
+                    self._load_from_cache()["products_marker"] = {
+                        "total": int(products_headers.get("X-WP-Total") or len(products)),
+                        "synced_at": sync_started
+                    }
+                self._update_cache_with_categories(categories, flush=False)
+                self._flush_cache()
             
             # Update last sync time
-            self.last_sync = time.time()
+            self.last_sync = time.monotonic()
             return True
         except Exception as e:
             logger.error(f"Error syncing data from WooCommerce API: {str(e)}")
@@ -1032,47 +1388,39 @@ class WooCommerceService:
         # Check if the ID is a product ID
         if service_id.startswith("service_"):
             try:
-                product_id = int(service_id.replace("service_", ""))
-                # Find the product with this ID
-                products = self.get_products()
-                for product in products:
-                    if product["id"] == product_id:
-                        # Transform to service format
-                        specialties = []
-                        for tag in product.get("tags", []):
-                            specialties.append(tag["name"])
-                        
-                        location = "Online"
-                        contact = ""
-                        hours = ""
-                        
-                        for attribute in product.get("attributes", []):
-                            if attribute["name"].lower() == "location":
-                                location = attribute["options"][0] if attribute["options"] else "Online"
-                            elif attribute["name"].lower() == "contact":
-                                contact = attribute["options"][0] if attribute["options"] else ""
-                            elif attribute["name"].lower() == "hours":
-                                hours = attribute["options"][0] if attribute["options"] else ""
-                        
-                        return {
-                            "id": service_id,
-                            "name": product["name"],
-                            "description": product["short_description"].strip() or product["description"].strip(),
-                            "location": location,
-                            "contact": contact,
-                            "website": "https://vogo.family",
-                            "specialties": specialties,
-                            "hours": hours,
-                            "price": product["price"],
-                            "image": product["images"][0]["src"] if product.get("images") else ""
-                        }
+                product_id = int(service_id.replace("service_", "", 1))
+                # Point lookup: the cached id index first, then products/<id>
+                product = self.get_product_by_id(product_id)
+                # Listings only ever held published products
+                if product is not None and product.get("status", "publish") == "publish":
+                    # Transform to service format
+                    specialties = []
+                    for tag in product.get("tags", []):
+                        specialties.append(tag["name"])
+                    
+                    attributes = _first_attribute_options(product)
+                    location = attributes.get("location") or "Online"
+                    contact = attributes.get("contact", "")
+                    hours = attributes.get("hours", "")
+                    
+                    return {
+                        "id": service_id,
+                        "name": product["name"],
+                        "description": product["short_description"].strip() or product["description"].strip(),
+                        "location": location,
+                        "contact": contact,
+                        "website": "https://vogo.family",
+                        "specialties": specialties,
+                        "hours": hours,
+                        "price": product["price"],
+                        "image": product["images"][0]["src"] if product.get("images") else ""
+                    }
             except (ValueError, KeyError):
                 pass
         
         # If not found or not a WooCommerce ID, try the local knowledge base
         try:
-            with open(self.kb_path, 'r') as f:
-                kb_data = json.load(f)
+            kb_data = _read_json_file(self.kb_path)
                 
             for service in kb_data.get("services", []):
                 if service["id"] == service_id:
@@ -1083,13 +1431,22 @@ class WooCommerceService:
             
         return None
 
-    def get_mall_delivery_services(self, location: Optional[str] = None) -> Dict[str, Any]:
-        """Get mall delivery services, optionally filtered by location"""
+    def _get_category_products(self, category: int, result_key: str, location: Optional[str] = None,
+                               extra_meta_keys: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """Get published products of a category as service listings, optionally filtered by location
+
+        Args:
+            category: WooCommerce category ID
+            result_key: Key the listings are returned under
+            location: Optional location the product location must contain
+            extra_meta_keys: meta_data keys copied onto each listing, without the leading underscore
+        """
         try:
             params = {
-                "category": CATEGORY_MALL_DELIVERY,
+                "category": category,
                 "per_page": 100,
-                "status": "publish"
+                "status": "publish",
+                "_fields": _SERVICE_FIELDS
             }
             
             if location:
@@ -1100,56 +1457,51 @@ class WooCommerceService:
             if not success:
                 return {"status": "error", "message": products}
             
-            services = []
+            location_lower = location.lower() if location else None
+            results = []
             for product in products:
                 # Extract location from product name or metadata
-                product_location = self._extract_location_from_product(product)
+                meta = _meta_dict(product)
+                product_location = self._extract_location_from_product(product, meta)
                 
                 # If location is specified and doesn't match, skip this product
-                if location and location.lower() not in product_location.lower():
+                if location_lower and location_lower not in product_location.lower():
                     continue
                 
-                # Extract available_cities from metadata if it exists
-                available_cities = self._get_meta_value(product, "_available_cities")
-                
-                # Extract available_malls from metadata if it exists
-                available_malls = self._get_meta_value(product, "_available_malls")
-                
-                services.append({
-                    "id": product["id"],
-                    "name": product["name"],
-                    "slug": product.get("slug", ""),
-                    "description": product.get("description", ""),
-                    "short_description": product.get("short_description", ""),
-                    "price": product.get("price", ""),
-                    "regular_price": product.get("regular_price", ""),
-                    "sale_price": product.get("sale_price", ""),
-                    "images": [img["src"] for img in product.get("images", [])],
-                    "categories": [cat["name"] for cat in product.get("categories", [])],
-                    "tags": [tag["name"] for tag in product.get("tags", [])],
-                    "location": product_location,
-                    "available_cities": available_cities,
-                    "available_malls": available_malls
-                })
+                service = _format_service(product, product_location, meta.get("_available_cities"))
+                for meta_key in extra_meta_keys:
+                    service[meta_key.lstrip("_")] = meta.get(meta_key)
+                results.append(service)
             
             return {
                 "status": "success",
-                "services": services
+                result_key: results
             }
         except Exception as e:
-            logger.error(f"Error fetching mall delivery services: {str(e)}")
+            logger.error(f"Error fetching {result_key} for category {category}: {str(e)}")
             return {"status": "error", "message": str(e)}
 
-    def _extract_location_from_product(self, product: Dict[str, Any]) -> str:
-        """Extract location from product name or metadata"""
+    def get_mall_delivery_services(self, location: Optional[str] = None) -> Dict[str, Any]:
+        """Get mall delivery services, optionally filtered by location"""
+        return self._get_category_products(CATEGORY_MALL_DELIVERY, "services", location,
+                                           extra_meta_keys=("_available_malls",))
+
+    def _extract_location_from_product(self, product: Dict[str, Any],
+                                       meta: Optional[Dict[str, Any]] = None) -> str:
+        """Extract location from product name or metadata
+
+        Callers that already built the product's _meta_dict pass it as ``meta``.
+        """
         # Try to extract from name (some products have format "Location - Store Name")
         name = product.get("name", "")
         if " - " in name:
             location = name.split(" - ")[0].strip()
-            return location
+            return sys.intern(location)
         
         # Try to get from available_cities metadata
-        available_cities = self._get_meta_value(product, "_available_cities")
+        if meta is None:
+            meta = _meta_dict(product)
+        available_cities = meta.get("_available_cities")
         if available_cities and isinstance(available_cities, list) and len(available_cities) > 0:
             return available_cities[0]
         
@@ -1157,14 +1509,7 @@ class WooCommerceService:
     
     def _get_meta_value(self, product: Dict[str, Any], meta_key: str) -> Any:
         """Get a value from product metadata by key"""
-        if "meta_data" not in product:
-            return None
-            
-        for meta in product["meta_data"]:
-            if meta.get("key") == meta_key:
-                return meta.get("value")
-                
-        return None
+        return _meta_dict(product).get(meta_key)
     
     def _is_mall_service(self, product: Dict[str, Any]) -> bool:
         """Check if a product is a mall delivery service"""
@@ -1178,108 +1523,11 @@ class WooCommerceService:
 
     def get_restaurant_services(self, location: Optional[str] = None) -> Dict[str, Any]:
         """Get restaurant services, optionally filtered by location"""
-        try:
-            params = {
-                "category": CATEGORY_RESTAURANT,
-                "per_page": 100,
-                "status": "publish"
-            }
-            
-            if location:
-                params["search"] = location
-            
-            success, products = self._make_request("products", params=params)
-            if not success:
-                return {"status": "error", "message": products}
-            
-            restaurants = []
-            for product in products:
-                # Extract location from product name or metadata
-                product_location = self._extract_location_from_product(product)
-                
-                # If location is specified and doesn't match, skip this product
-                if location and location.lower() not in product_location.lower():
-                    continue
-                
-                # Extract available_cities from metadata if it exists
-                available_cities = self._get_meta_value(product, "_available_cities")
-                
-                restaurants.append({
-                    "id": product["id"],
-                    "name": product["name"],
-                    "slug": product.get("slug", ""),
-                    "description": product.get("description", ""),
-                    "short_description": product.get("short_description", ""),
-                    "price": product.get("price", ""),
-                    "regular_price": product.get("regular_price", ""),
-                    "sale_price": product.get("sale_price", ""),
-                    "images": [img["src"] for img in product.get("images", [])],
-                    "categories": [cat["name"] for cat in product.get("categories", [])],
-                    "tags": [tag["name"] for tag in product.get("tags", [])],
-                    "location": product_location,
-                    "available_cities": available_cities
-                })
-            
-            return {
-                "status": "success",
-                "restaurants": restaurants
-            }
-        except Exception as e:
-            logger.error(f"Error fetching restaurant services: {str(e)}")
-            return {"status": "error", "message": str(e)}
+        return self._get_category_products(CATEGORY_RESTAURANT, "restaurants", location)
             
     def get_pet_care_products(self, location: Optional[str] = None) -> Dict[str, Any]:
         """Get pet care products, optionally filtered by location"""
-        try:
-            params = {
-                "category": CATEGORY_PET_CARE,
-                "per_page": 100,
-                "status": "publish"
-            }
-            
-            if location:
-                params["search"] = location
-            
-            success, products = self._make_request("products", params=params)
-            if not success:
-                return {"status": "error", "message": products}
-            
-            pet_products = []
-            for product in products:
-                # Extract location from product name or metadata
-                product_location = self._extract_location_from_product(product)
-                
-                # If location is specified and doesn't match, skip this product
-                if location and location.lower() not in product_location.lower():
-                    continue
-                
-                # Extract available_cities from metadata if it exists
-                available_cities = self._get_meta_value(product, "_available_cities")
-                
-                pet_products.append({
-                    "id": product["id"],
-                    "name": product["name"],
-                    "slug": product.get("slug", ""),
-                    "description": product.get("description", ""),
-                    "short_description": product.get("short_description", ""),
-                    "price": product.get("price", ""),
-                    "regular_price": product.get("regular_price", ""),
-                    "sale_price": product.get("sale_price", ""),
-                    "images": [img["src"] for img in product.get("images", [])],
-                    "categories": [cat["name"] for cat in product.get("categories", [])],
-                    "tags": [tag["name"] for tag in product.get("tags", [])],
-                    "location": product_location,
-                    "available_cities": available_cities
-                })
-            
-            return {
-                "status": "success",
-                "pet_products": pet_products
-            }
-        except Exception as e:
-            logger.error(f"Error fetching pet care products: {str(e)}")
-            return {"status": "error", "message": str(e)}
-{{ ... }}
+        return self._get_category_products(CATEGORY_PET_CARE, "pet_products", location)
 
     def get_products(self, category: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """Get products from WooCommerce API
@@ -1292,27 +1540,21 @@ class WooCommerceService:
             List of product dictionaries
         """
         try:
-            # Check if we have a valid cache that's not expired
-            cached_data = self._get_cached_data()
-            if cached_data and not self._is_cache_expired(cached_data) and 'products' in cached_data:
-                products = cached_data['products']
-                
-                # Filter by category if specified
-                if category and products:
-                    # Check if category is a numeric ID or a slug
-                    try:
-                        category_id = int(category)
-                        products = [p for p in products if any(cat.get('id') == category_id for cat in p.get('categories', []))]
-                    except ValueError:
-                        # If not a numeric ID, treat as a slug
-                        products = [p for p in products if any(cat.get('slug') == category for cat in p.get('categories', []))]
+            # Check if we have a products cache that's not expired
+            products = self.cache["products"]
+            if products and time.time() - self._products_cached_at < self.cache_expiration:
+                # Filter by category (numeric ID or slug) if specified
+                if category:
+                    products = self._get_product_table().filter_by_category(category)
                 
                 logger.info(f"Using cached products data ({len(products)} products)")
                 return products[:limit]
             
-            # Use the authenticated API
+            # Use the authenticated API, paging since per_page is capped at 100
+            per_page = max(1, min(limit, WC_MAX_PER_PAGE))
             params = {
-                "per_page": limit,
+                "per_page": per_page,
+                "page": 1,
                 "status": "publish"
             }
             
@@ -1334,10 +1576,18 @@ class WooCommerceService:
                         # If can't find category ID, use slug in search
                         params["search"] = category
                         
-            success, data = self._make_request("products", params=params)
+            success, data, headers = self._make_request("products", params=params, return_headers=True)
             if success and isinstance(data, list):
-                # Cache the products for future use
-                self._update_cache_with_products(data)
+                # Fetch the remaining pages concurrently
+                total_pages = int(headers.get("X-WP-TotalPages") or 1)
+                last_page = min(total_pages, math.ceil(limit / per_page))
+                if last_page > 1:
+                    data.extend(self._fetch_pages("products", params, list(range(2, last_page + 1))))
+
+                # Cache the products for future use, but only a full catalogue: a
+                # category or limit subset would hide the rest from later lookups
+                if not category and last_page == total_pages:
+                    self._update_cache_with_products(data)
                 return data[:limit]
             
             logger.warning(f"Failed to fetch products: {data}")
@@ -1346,7 +1596,6 @@ class WooCommerceService:
         except Exception as e:
             logger.error(f"Error in get_products: {str(e)}")
             return []
-{{ ... }}
 
     def create_order(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new order in WooCommerce
@@ -1387,7 +1636,6 @@ class WooCommerceService:
                 "status": "error",
                 "message": error_msg
             }
-{{ ... }}
 
     def get_service_locations(self) -> List[Dict[str, Any]]:
         """
@@ -1427,4 +1675,3 @@ class WooCommerceService:
         except Exception as e:
             logger.error(f"Error getting service locations: {str(e)}")
             return [{"name": location, "id": location.lower().replace(" ", "-")} for location in LOCATIONS]
-{{ ... }}
@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 import os
-import requests
+import sys
+import logging
+import httpx
 from base64 import b64encode
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -13,123 +22,133 @@ load_dotenv()
 wp_api_url = os.environ.get("WP_API_URL", "https://vogo.family")
 consumer_key = os.environ.get("WP_CONSUMER_KEY", "ck_47075e7afebb1ad956d0350ee9ada1c93f3dbbaa")
 consumer_secret = os.environ.get("WP_CONSUMER_SECRET", "cs_c264cd481899b999ce5cd3cc3b97ff7cb32aab07")
+API_INDEX_URL = f"{wp_api_url}/wp-json/"
+
+# One HTTP/2 client for the whole run: every probe targets the same origin, so
+# the concurrent requests are multiplexed over a single TLS connection.
+# Connection failures are retried; 3 s to connect, 10 s for everything else.
+CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    ),
+    timeout=httpx.Timeout(10.0, connect=3.0)
+)
+
+# Basic Auth header, encoded once. It is passed per request rather than set on
+# the client so the query-parameter probes stay unauthenticated by header.
+BASIC_AUTH_HEADERS = {
+    "Authorization": f"Basic {b64encode(f'{consumer_key}:{consumer_secret}'.encode()).decode()}"
+}
+
+# Credentials as query parameters, the other auth method the sweep tries
+AUTH_PARAMS = {
+    "consumer_key": consumer_key,
+    "consumer_secret": consumer_secret
+}
+
+# auth method -> (label, request kwargs)
+AUTH_METHODS = {
+    # Method 1: Basic Auth
+    "basic": ("Basic Auth", {"headers": BASIC_AUTH_HEADERS}),
+    # Method 2: Query Parameters
+    "query": ("Query Parameters", {"params": AUTH_PARAMS})
+}
+
+log = logging.getLogger(__name__)
+
+# Start of a JSON object or array inside a malformed response body
+_JSON_START = re.compile(r'[\[{]')
+_DECODER = json.JSONDecoder()
 
 def print_section(title):
-    print("\n" + "="*80)
-    print(f" {title} ".center(80, "="))
-    print("="*80)
+    log.info("\n%s\n%s\n%s", "="*80, f" {title} ".center(80, "="), "="*80)
 
 def try_handle_response(response):
     """Try different ways to handle potentially malformed JSON response"""
-    print(f"Status code: {response.status_code}")
-    print(f"Response headers: {response.headers}")
+    log.info("Status code: %s", response.status_code)
     
-    # Print raw response first
-    print("\nRaw response:")
-    print("-" * 50)
-    raw_text = response.text[:500]  # First 500 chars to avoid huge output
-    print(raw_text)
-    print("-" * 50)
+    # Headers and the raw response are only formatted when debug output is on
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Response headers: %s", response.headers)
+        raw_text = response.content[:500].decode(errors="replace")  # First 500 bytes to avoid huge output
+        log.debug("\nRaw response:\n%s\n%s\n%s", "-" * 50, raw_text, "-" * 50)
     
     # Try to parse as JSON
     try:
-        data = response.json()
-        print("\nParsed as JSON successfully!")
+        # orjson decodes the bytes directly; its JSONDecodeError subclasses json's
+        data = orjson.loads(response.content) if orjson is not None else response.json()
+        log.info("\nParsed as JSON successfully!")
         return data
     except json.JSONDecodeError as e:
-        print(f"\nJSON decode error: {str(e)}")
+        log.warning("\nJSON decode error: %s", e)
         
-        # Try to find valid JSON by trimming the response
-        try:
-            # If it starts with a number followed by some character, try removing that
-            text = response.text.strip()
-            if text and text[0].isdigit():
-                for i in range(len(text)):
-                    if not text[i].isdigit():
-                        trimmed = text[i:].strip()
-                        break
-                else:
-                    trimmed = ""
-                
-                if trimmed and (trimmed.startswith('{') or trimmed.startswith('[')):
-                    print("\nTrying to parse trimmed response...")
-                    return json.loads(trimmed)
-        except Exception as trim_err:
-            print(f"Error while trimming: {str(trim_err)}")
-        
-        # If all else fails, try to extract anything that looks like JSON
-        try:
-            text = response.text
-            start_idx = text.find('{')
-            end_idx = text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-                potential_json = text[start_idx:end_idx+1]
-                print("\nExtracted potential JSON object...")
-                return json.loads(potential_json)
-            
-            start_idx = text.find('[')
-            end_idx = text.rfind(']')
-            
-            if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-                potential_json = text[start_idx:end_idx+1]
-                print("\nExtracted potential JSON array...")
-                return json.loads(potential_json)
-        except Exception as extract_err:
-            print(f"Error extracting JSON: {str(extract_err)}")
+        # The body may have junk (PHP notices, a length prefix, HTML) around the
+        # JSON, so decode the first value that starts at a '{' or '['
+        text = response.text
+        for match in _JSON_START.finditer(text):
+            try:
+                data, _ = _DECODER.raw_decode(text, match.start())
+            except json.JSONDecodeError:
+                continue
+            log.info("\nExtracted JSON starting at offset %d...", match.start())
+            return data
     
-    print("\nCould not parse response as JSON.")
+    log.warning("\nCould not parse response as JSON.")
     return None
 
 def test_api_index():
     """Test the main WordPress API index"""
     print_section("TESTING WORDPRESS API INDEX")
-    url = f"{wp_api_url}/wp-json/"
+    url = API_INDEX_URL
     
     try:
-        response = requests.get(url)
+        response = CLIENT.get(url)
         return try_handle_response(response)
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log.error("Error: %s", e)
         return None
 
-def test_woo_endpoints(endpoints=None):
+# Endpoints probed when test_woo_endpoints is called without a list
+DEFAULT_WOO_ENDPOINTS = [
+    "wp-json/wc/v3/products",
+    "wp-json/wc/store/v1/products",
+    "wp-json/wc/v3/products/categories",
+    "wp-json/wc/store/v1/products/categories"
+]
+
+# Full URLs of the default endpoints, built once
+ENDPOINT_URLS = {endpoint: f"{wp_api_url}/{endpoint}" for endpoint in DEFAULT_WOO_ENDPOINTS}
+
+def test_woo_endpoints(endpoints=None, auth_methods=("basic", "query")):
     """Test various WooCommerce endpoints with different authentication methods"""
     if endpoints is None:
-        endpoints = [
-            "wp-json/wc/v3/products",
-            "wp-json/wc/store/v1/products",
-            "wp-json/wc/v3/products/categories",
-            "wp-json/wc/store/v1/products/categories"
-        ]
+        endpoints = DEFAULT_WOO_ENDPOINTS
     
     results = {}
     
-    for endpoint in endpoints:
+    # The probes are independent, so send them all at once and report in order
+    with ThreadPoolExecutor(max_workers=min(len(auth_methods) * len(endpoints), 16) or 1) as executor:
+        probes = [
+            (endpoint, [
+                (method, executor.submit(CLIENT.get, ENDPOINT_URLS.get(endpoint) or f"{wp_api_url}/{endpoint}",
+                                         **AUTH_METHODS[method][1]))
+                for method in auth_methods
+            ])
+            for endpoint in endpoints
+        ]
+    
+    for endpoint, futures in probes:
         print_section(f"TESTING ENDPOINT: {endpoint}")
-        full_url = f"{wp_api_url}/{endpoint}"
-        
-        # Method 1: Basic Auth
-        print("\n[Testing with Basic Auth]")
-        try:
-            auth_string = b64encode(f"{consumer_key}:{consumer_secret}".encode()).decode()
-            headers = {"Authorization": f"Basic {auth_string}"}
-            response = requests.get(full_url, headers=headers)
-            results[f"{endpoint}_basic"] = try_handle_response(response)
-        except Exception as e:
-            print(f"Error with Basic Auth: {str(e)}")
         
-        # Method 2: Query Parameters
-        print("\n[Testing with Query Parameters]")
-        try:
-            params = {
-                "consumer_key": consumer_key,
-                "consumer_secret": consumer_secret
-            }
-            response = requests.get(full_url, params=params)
-            results[f"{endpoint}_query"] = try_handle_response(response)
-        except Exception as e:
-            print(f"Error with Query Params: {str(e)}")
+        for method, future in futures:
+            label = AUTH_METHODS[method][0]
+            log.info("\n[Testing with %s]", label)
+            try:
+                results[f"{endpoint}_{method}"] = try_handle_response(future.result())
+            except Exception as e:
+                log.error("Error with %s: %s", label, e)
         
         # Method 3: OAuth 1.0a
         # OAuth 1.0a is more complex, and requires additional libraries
@@ -142,46 +161,59 @@ def test_rest_api_discovery():
     print_section("DISCOVERING REST API ENDPOINTS")
     
     # Try to check what namespaces and endpoints are available
-    url = f"{wp_api_url}/wp-json/"
+    url = API_INDEX_URL
     
     try:
-        print(f"Checking API root: {url}")
-        response = requests.get(url)
+        log.info("Checking API root: %s", url)
+        response = CLIENT.get(url)
         data = try_handle_response(response)
         
         if data and isinstance(data, dict):
             # Check for namespaces
             namespaces = data.get('namespaces', [])
             if namespaces:
-                print("\nFound namespaces:")
+                log.info("\nFound namespaces:")
                 for ns in namespaces:
-                    print(f"  - {ns}")
+                    log.info("  - %s", ns)
             
             # Check for routes
             routes = data.get('routes', {})
             if routes:
-                print("\nFound routes:")
+                log.info("\nFound routes:")
                 wc_routes = []
                 for route, info in routes.items():
                     if 'wc' in route:
-                        print(f"  - {route}")
+                        log.info("  - %s", route)
                         wc_routes.append(route)
                 
-                # If we found WooCommerce routes, test them
-                if wc_routes:
-                    print("\nTesting discovered WooCommerce endpoints...")
-                    test_woo_endpoints(wc_routes)
+                # Only probe concrete routes that the default sweep didn't cover;
+                # patterns like /wc/v3/products/(?P<id>[\d]+) would just 404
+                wc_endpoints = [
+                    endpoint for endpoint in dict.fromkeys(f"wp-json{route}" for route in wc_routes
+                                                           if '(' not in route and '<' not in route)
+                    if endpoint not in DEFAULT_WOO_ENDPOINTS
+                ]
+                
+                # If we found WooCommerce routes, test them (one auth method is enough here)
+                if wc_endpoints:
+                    log.info("\nTesting discovered WooCommerce endpoints...")
+                    test_woo_endpoints(wc_endpoints, auth_methods=("basic",))
         
         return data
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log.error("Error: %s", e)
         return None
 
 def main():
     """Main function to run tests"""
+    # Full output on a terminal; only problems when run from CI or piped. LOG_LEVEL overrides.
+    default_level = "DEBUG" if sys.stdout.isatty() else "WARNING"
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", default_level).upper(), format="%(message)s",
+                        stream=sys.stdout)
+    
     print_section("WOOCOMMERCE API TEST")
-    print(f"Testing WooCommerce API at {wp_api_url}")
-    print(f"Using consumer key: {consumer_key[:5]}...{consumer_key[-5:]}")
+    log.info("Testing WooCommerce API at %s", wp_api_url)
+    log.info("Using consumer key: %s...%s", consumer_key[:5], consumer_key[-5:])
     
     # Test 1: Try to access the main API index
     api_index = test_api_index()
@@ -192,6 +224,7 @@ def main():
     # Test 3: Try to discover REST API endpoints
     api_discovery = test_rest_api_discovery()
     
+    CLIENT.close()
     print_section("TESTING COMPLETE")
 
 if __name__ == "__main__":
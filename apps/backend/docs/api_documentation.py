@@ -1,9 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -11,24 +20,60 @@ load_dotenv()
 WP_API_URL = os.getenv("WP_API_URL", "https://vogo.family/wp-json/")
 WP_CONSUMER_KEY = os.getenv("WP_CONSUMER_KEY")
 WP_CONSUMER_SECRET = os.getenv("WP_CONSUMER_SECRET")
+WC_API_BASE = f"{WP_API_URL}wc/v3/"
+AUTH = (WP_CONSUMER_KEY, WP_CONSUMER_SECRET)
+
+# (connect, read) timeout for every request
+REQUEST_TIMEOUT = (3, 10)
+
+# Retry GETs on connection errors and transient server responses
+RETRY = Retry(total=3, backoff_factor=0.3,
+              status_forcelist=(429, 500, 502, 503, 504),
+              allowed_methods=("GET",), raise_on_status=False)
+
+def _parse_json(response):
+    """Decode a JSON response body, straight from the bytes when orjson is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _response_sample(parsed):
+    """Pretty-printed JSON shown in the markdown docs: the first item of a list, or the object itself"""
+    if isinstance(parsed, list) and parsed:
+        sample = parsed[0]
+    elif isinstance(parsed, dict):
+        sample = parsed
+    else:
+        return None
+    if orjson is not None:
+        return orjson.dumps(sample, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(sample, indent=2)
 
-def test_endpoint(endpoint, method="GET", params=None, data=None):
-    """Test a WooCommerce API endpoint and return formatted results"""
-    url = f"{WP_API_URL}wc/v3/{endpoint}"
-    auth = (WP_CONSUMER_KEY, WP_CONSUMER_SECRET)
+def test_endpoint(endpoint, method="GET", params=None, data=None, session=None):
+    """Test a WooCommerce API endpoint and return formatted results
+
+    Pass a shared requests.Session to reuse its connections; without one
+    each call opens a new connection.
+    """
+    url = WC_API_BASE + endpoint
+    auth = AUTH
+    http = session or requests
     
     try:
         if method == "GET":
-            response = requests.get(url, auth=auth, params=params)
+            response = http.get(url, auth=auth, params=params, timeout=REQUEST_TIMEOUT)
         elif method == "POST":
-            response = requests.post(url, json=data, auth=auth)
+            response = http.post(url, json=data, auth=auth, timeout=REQUEST_TIMEOUT)
         
+        parsed = _parse_json(response) if response.status_code == 200 else response.text
         return {
             "endpoint": endpoint,
             "method": method,
             "url": url,
             "status_code": response.status_code,
-            "response": response.json() if response.status_code == 200 else response.text
+            "response": parsed,
+            # Serialized here, on the worker thread, so the markdown pass does no JSON work
+            "response_sample": _response_sample(parsed)
         }
         
     except Exception as e:
@@ -56,6 +101,8 @@ def generate_api_documentation():
     }
     
     # Test Products API
+    # The JSON docs keep each listing's whole first page as a realistic sample;
+    # the markdown only shows the first product's structure
     product_endpoints = {
         "list_products": {
             "endpoint": "products",
@@ -79,11 +126,6 @@ def generate_api_documentation():
         }
     }
     
-    docs["endpoints"]["products"] = {}
-    for name, config in product_endpoints.items():
-        result = test_endpoint(config["endpoint"], params=config["params"])
-        docs["endpoints"]["products"][name] = result
-    
     # Test Categories API
     category_endpoints = {
         "list_categories": {
@@ -104,11 +146,6 @@ def generate_api_documentation():
         }
     }
     
-    docs["endpoints"]["categories"] = {}
-    for name, config in category_endpoints.items():
-        result = test_endpoint(config["endpoint"], params=config["params"])
-        docs["endpoints"]["categories"][name] = result
-    
     # Test Orders API
     order_endpoints = {
         "list_orders": {
@@ -117,57 +154,90 @@ def generate_api_documentation():
         }
     }
     
-    docs["endpoints"]["orders"] = {}
-    for name, config in order_endpoints.items():
-        result = test_endpoint(config["endpoint"], params=config["params"])
-        docs["endpoints"]["orders"][name] = result
+    all_endpoints = {
+        "products": product_endpoints,
+        "categories": category_endpoints,
+        "orders": order_endpoints
+    }
+    
+    # The calls are independent, so run them all at once over one pooled session
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=10, max_retries=RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    with session, ThreadPoolExecutor(max_workers=10) as executor:
+        futures = {
+            bucket: {
+                name: executor.submit(test_endpoint, config["endpoint"],
+                                      params=config["params"], session=session)
+                for name, config in endpoints.items()
+            }
+            for bucket, endpoints in all_endpoints.items()
+        }
+        for bucket, bucket_futures in futures.items():
+            docs["endpoints"][bucket] = {
+                # The pretty name is worked out once here
+                name: {**future.result(), "display_name": name.replace("_", " ").title()}
+                for name, future in bucket_futures.items()
+            }
     
     # Save documentation
     os.makedirs("docs", exist_ok=True)
-    with open("docs/api_documentation.json", "w", encoding="utf-8") as f:
-        json.dump(docs, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open("docs/api_documentation.json", "wb") as f:
+            f.write(orjson.dumps(docs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open("docs/api_documentation.json", "w", encoding="utf-8") as f:
+            json.dump(docs, f, indent=2, ensure_ascii=False)
     
     # Generate markdown documentation
     generate_markdown_docs(docs)
 
-def generate_markdown_docs(docs):
-    """Generate markdown documentation from the API test results"""
-    
-    md = f"""# Vogo.Family WooCommerce API Documentation
-Generated at: {docs['generated_at']}
+# Top of the markdown docs; the rest is generated per endpoint
+HEADER_TMPL = Template("""# Vogo.Family WooCommerce API Documentation
+Generated at: $generated_at
 
 ## Base URL
-{docs['base_url']}
+$base_url
 
 ## Authentication
-- Type: {docs['authentication']['type']}
+- Type: $auth_type
 - Parameters:
-  - consumer_key: {docs['authentication']['parameters']['consumer_key']}
-  - consumer_secret: {docs['authentication']['parameters']['consumer_secret']}
+  - consumer_key: $consumer_key
+  - consumer_secret: $consumer_secret
 
 ## Endpoints
 
-"""
+""")
+
+def generate_markdown_docs(docs):
+    """Generate markdown documentation from the API test results"""
+    
+    header_md = HEADER_TMPL.substitute(
+        generated_at=docs['generated_at'],
+        base_url=docs['base_url'],
+        auth_type=docs['authentication']['type'],
+        consumer_key=docs['authentication']['parameters']['consumer_key'],
+        consumer_secret=docs['authentication']['parameters']['consumer_secret']
+    )
     
+    # Collect the pieces and join once instead of growing one string
+    parts = [header_md]
     for category, endpoints in docs["endpoints"].items():
-        md += f"### {category.title()}\n\n"
+        parts.append(f"### {category.title()}\n\n")
         
         for name, result in endpoints.items():
-            md += f"#### {name.replace('_', ' ').title()}\n"
-            md += f"- Method: {result['method']}\n"
-            md += f"- Endpoint: `{result['endpoint']}`\n"
+            parts.append(f"#### {result['display_name']}\n")
+            parts.append(f"- Method: {result['method']}\n")
+            parts.append(f"- Endpoint: `{result['endpoint']}`\n")
             
-            if isinstance(result.get('response'), list) and len(result['response']) > 0:
-                md += "- Response Structure:\n```json\n"
-                md += json.dumps(result['response'][0], indent=2)
-                md += "\n```\n\n"
-            elif isinstance(result.get('response'), dict):
-                md += "- Response Structure:\n```json\n"
-                md += json.dumps(result['response'], indent=2)
-                md += "\n```\n\n"
+            if result.get('response_sample'):
+                parts.append("- Response Structure:\n```json\n")
+                parts.append(result['response_sample'])
+                parts.append("\n```\n\n")
     
     with open("docs/api_documentation.md", "w", encoding="utf-8") as f:
-        f.write(md)
+        f.write("".join(parts))
 
 if __name__ == "__main__":
     print("Generating API documentation...")
@@ -1,15 +1,8 @@
-import requests
 import json
 
-response = requests.get(
-    'https://vogo.family/wp-json/wc/v3/products/categories',
-    auth=(
-        'ck_47075e7afebb1ad956d0350ee9ada1c93f3dbbaa',
-        'cs_c264cd481899b999ce5cd3cc3b97ff7cb32aab07'
-    )
-)
+from woo_http import cached_get
 
-categories = response.json()
+categories = cached_get('products/categories')
 
 # Print categories in a readable format
 print("Available Categories:")
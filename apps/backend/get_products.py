@@ -1,14 +1,21 @@
-import requests
 import json
 
-response = requests.get(
-    'https://vogo.family/wp-json/wc/v3/products',
-    auth=(
-        'ck_47075e7afebb1ad956d0350ee9ada1c93f3dbbaa',
-        'cs_c264cd481899b999ce5cd3cc3b97ff7cb32aab07'
-    )
-)
-
-products = response.json()
-with open('products_latest.json', 'w') as f:
-    json.dump(products, f, indent=2)
+from woo_http import iter_all_items
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
+# Only the fields this dump is used for; leaves out description HTML, meta_data, etc.
+PRODUCT_FIELDS = "id,name,slug,price,categories,tags"
+
+# Fetch every page (100 products each) and write one product per line (JSON Lines)
+# as each is decoded, so readers can stream the file too
+with open('products_latest.jsonl', 'wb') as f:
+    for product in iter_all_items('products', {'_fields': PRODUCT_FIELDS}):
+        if orjson is not None:
+            f.write(orjson.dumps(product))
+        else:
+            f.write(json.dumps(product, ensure_ascii=False).encode('utf-8'))
+        f.write(b"\n")
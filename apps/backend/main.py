@@ -7,17 +7,44 @@ import uvicorn
 
 app = FastAPI(title="Vogo.Family Chatbot API")
 =======
-from fastapi import FastAPI, HTTPException, Depends, File, UploadFile
+from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import uvicorn
 import os
+import json
+import asyncio
+import time
+import hashlib
+import re
+import tempfile
+import threading
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from dotenv import load_dotenv
 import logging
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional; responses are then gzip-compressed only
+    BrotliMiddleware = None
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional; only needed when PROFILE is set
+    Profiler = None
+
 # Load environment variables from .env file
 load_dotenv()
 from app.rag.mock_engine import RAGEngine
@@ -34,44 +61,87 @@ from app.services.email_notification_service import EmailNotificationService
 from app.services.ticketing_service import TicketingService
 
 # Import enhanced WooCommerce services
-from app.services.enhanced_woocommerce_service import EnhancedWooCommerceService
+from app.services.enhanced_woocommerce_service import get_enhanced_woocommerce_service
 from app.services.enhanced_order_service import EnhancedOrderService
 from app.services.customer_service import CustomerService
-from app.services.product_service import ProductService
-from app.services.openai_service import OpenAIService
+from app.services.product_service import get_product_service
+from app.services.openai_service import get_openai_service
 from app.services.intent_detection_service import IntentDetectionService
 from app.services.location_service import LocationService
 from app.services.mall_delivery_service import MallDeliveryService
+from app.services.semantic_cache import SemanticCache
+from app.services.conversation_store import ConversationStore
 
 # Import API routers
 from app.api.mobile_router import router as mobile_router
 from app.api.ai_shopping_router import router as ai_shopping_router
 
-app = FastAPI()
+# orjson is optional; ORJSONResponse needs it installed
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
 
-# Configure CORS
+app = FastAPI(default_response_class=DefaultJSONResponse)
+
+# Configure CORS with explicit lists: wildcards are invalid together with
+# credentials and make Starlette check every header of every request.
+# Browsers may cache a preflight for CORS_MAX_AGE seconds.
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "https://vogo.family,http://localhost:3000").split(",")
+CORS_MAX_AGE = 86400
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match"],
+    max_age=CORS_MAX_AGE,
 )
 
+# Compress response bodies of at least COMPRESS_MIN_SIZE bytes for clients
+# that accept it: Brotli when brotli-asgi is installed (it still serves gzip
+# to clients without Brotli support), gzip otherwise
+COMPRESS_MIN_SIZE = 1024
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=COMPRESS_MIN_SIZE)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_SIZE, compresslevel=5)
+
 app.title = "Vogo.Family Chatbot API"
 >>>>>>> 9c26091 (backend try)
 
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 <<<<<<< HEAD
 =======
+# Endpoints that only call the (synchronous) services are plain `def`, which FastAPI
+# runs in its threadpool. `async def` is for handlers that await something, and
+# any blocking call inside them goes through run_in_threadpool.
+
+# With PROFILE set (and pyinstrument installed) every request is profiled and
+# the last PROFILE_HISTORY reports per route are served by /profiling. Only
+# the event loop thread is sampled, so time a plain `def` endpoint spends in
+# the threadpool shows up as a single await.
+PROFILE_HISTORY = 10
+_profiles: Dict[str, deque] = {}
+
+if os.getenv("PROFILE") and Profiler is not None:
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        if request.url.path == "/profiling":
+            return await call_next(request)
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            return await call_next(request)
+        finally:
+            profiler.stop()
+            _profiles.setdefault(request.url.path, deque(maxlen=PROFILE_HISTORY)).append(profiler)
+
+    @app.get("/profiling", response_class=HTMLResponse)
+    def profiling(route: str = "/chat", index: int = -1):
+        """pyinstrument report for a recent request to ``route`` (``index`` -1 is the latest)"""
+        try:
+            profiler = _profiles[route][index]
+        except (KeyError, IndexError):
+            raise HTTPException(status_code=404, detail=f"No profile recorded for {route}")
+        return HTMLResponse(profiler.output_html())
+
 # Include API routers
 app.include_router(mobile_router)
 app.include_router(ai_shopping_router)
@@ -91,31 +161,189 @@ email_notification_service = EmailNotificationService()
 ticketing_service = TicketingService()
 
 # Initialize enhanced WooCommerce services
-enhanced_woocommerce_service = EnhancedWooCommerceService()
+enhanced_woocommerce_service = get_enhanced_woocommerce_service()
 enhanced_order_service = EnhancedOrderService(woocommerce_service=enhanced_woocommerce_service)
 customer_service = CustomerService(woocommerce_service=enhanced_woocommerce_service)
-product_service = ProductService(woocommerce_service=enhanced_woocommerce_service)
+product_service = get_product_service()
 mall_delivery_service = MallDeliveryService(woocommerce_service=woocommerce_service)
-openai_service = OpenAIService()
+openai_service = get_openai_service()
 location_service = LocationService()
 intent_detection_service = IntentDetectionService(woocommerce_service=woocommerce_service)
+# Intent pipeline results keyed by query embedding, so near-duplicate questions skip it.
+# Results carry live product prices and stock, so entries expire like the response cache's
+INTENT_CACHE_TTL = 300
+intent_cache = SemanticCache(threshold=0.05, capacity=1024, ttl=INTENT_CACHE_TTL)
+INTENT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "chatbot_intent_cache.npz")
+
+@app.on_event("startup")
+async def load_intent_cache():
+    intent_cache.load(INTENT_CACHE_PATH)
+    openai_service.embedding_batcher.start()
+
+@app.on_event("startup")
+async def warm_up_services():
+    """Load caches and open upstream connections before the first request needs them
+
+    Runs in the background so a slow WooCommerce or OpenAI doesn't hold up startup.
+    """
+    async def warm_up():
+        try:
+            await asyncio.gather(run_in_threadpool(woocommerce_service.warm_up),
+                                 openai_service.embed("warmup"))
+        except Exception as e:
+            logger.warning(f"Warm-up failed: {str(e)}")
+    app.state.warm_up_task = asyncio.create_task(warm_up())
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await ticket_service.aclose()
+
+@app.on_event("shutdown")
+async def save_intent_cache():
+    await openai_service.embedding_batcher.stop()
+    try:
+        intent_cache.save(INTENT_CACHE_PATH)
+    except Exception as e:
+        logger.error(f"Error saving intent cache: {str(e)}")
+
+# Serialized bodies of slow-changing catalogue GETs: key -> (expires_at, bytes, etag)
+RESPONSE_CACHE_TTL = 300
+RESPONSE_CACHE_MAXSIZE = 1024
+# How long clients may reuse a catalogue response before revalidating it
+CLIENT_MAX_AGE = 60
+_response_cache: Dict[tuple, tuple] = {}
+# One lock per key, so concurrent misses wait for a single upstream fetch
+_response_build_locks: Dict[tuple, threading.Lock] = {}
+_response_build_locks_guard = threading.Lock()
+
+def _is_cacheable(data) -> bool:
+    """Error results and empty payloads aren't cached; the services return [] when WooCommerce fails"""
+    if not isinstance(data, dict):
+        return bool(data)
+    if data.get("status") == "error":
+        return False
+    payload = [value for name, value in data.items() if name != "status"]
+    return any(value not in ([], {}, None) for value in payload)
+
+def _build_cached_response(key: tuple, build, now: float) -> tuple:
+    data = build()
+    body = orjson.dumps(data) if orjson is not None else json.dumps(data).encode("utf-8")
+    entry = (now + RESPONSE_CACHE_TTL, body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+    if _is_cacheable(data):
+        if len(_response_cache) >= RESPONSE_CACHE_MAXSIZE:
+            # Handlers run in the threadpool, so snapshot before pruning
+            for stale in [k for k, (expires, _, _) in list(_response_cache.items()) if expires <= now]:
+                _response_cache.pop(stale, None)
+            if len(_response_cache) >= RESPONSE_CACHE_MAXSIZE:
+                _response_cache.clear()
+        _response_cache[key] = entry
+    return entry
+
+def cached_json_response(request: Request, key: tuple, build) -> Response:
+    """Return the cached JSON body for ``key``, calling ``build()`` when it is missing or stale
+
+    Bodies are stored already serialized, so a hit skips both the WooCommerce
+    request and response encoding. Each body carries an ETag; a client sending
+    it back in If-None-Match gets an empty 304. Error and empty results are not cached.
+    Concurrent misses for the same key share one ``build()`` call.
+    """
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        with _response_build_locks_guard:
+            lock = _response_build_locks.setdefault(key, threading.Lock())
+        with lock:
+            # Another request may have rebuilt the entry while this one waited
+            now = time.monotonic()
+            entry = _response_cache.get(key)
+            if entry is None or entry[0] <= now:
+                entry = _build_cached_response(key, build, now)
+            with _response_build_locks_guard:
+                # Later requests find the fresh entry, so the lock isn't needed any more
+                _response_build_locks.pop(key, None)
+    _, body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": f"max-age={CLIENT_MAX_AGE}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Last intent, products and location per conversation_id
+conversation_store = ConversationStore(ttl=1800, maxsize=10000)
+
+# Short follow-ups that refer back to the previous turn's products: an explicit
+# ordinal ("the second one", "al doilea") or a confirmation with a referent
+# ("yes, that one", "I'll take it", "da, pe acela")
+_ORDINALS = {
+    "first": 0, "1st": 0, "second": 1, "2nd": 1, "third": 2, "3rd": 2, "last": -1,
+    "primul": 0, "prima": 0, "al doilea": 1, "a doua": 1, "al treilea": 2, "a treia": 2,
+    "ultimul": -1, "ultima": -1,
+}
+_CONFIRMATION = r"(?:yes|yeah|sure|ok|da|sigur)"
+_ORDINAL_FOLLOWUP = re.compile(
+    r"^(?:" + _CONFIRMATION + r" )?(?:(?:i'?ll take|i want|give me|vreau|iau) )?(?:the )?"
+    r"(?P<ordinal>" + "|".join(sorted(map(re.escape, _ORDINALS), key=len, reverse=True)) + r")"
+    r"(?: one)?(?: please| te rog)?$"
+)
+_CONFIRM_FOLLOWUP = re.compile(
+    r"^(?:" + _CONFIRMATION + r" (?:that|this)(?: one)?"
+    r"|" + _CONFIRMATION + r" (?:pe )?(?:acela|aceea|asta)"
+    r"|(?:" + _CONFIRMATION + r" )?(?:i'?ll take|i want|i'?ll order|give me) (?:it|that|this)(?: one)?"
+    r"|(?:" + _CONFIRMATION + r" )?(?:o|il) (?:vreau|iau|comand))"
+    r"(?: please| te rog)?$"
+)
+_FOLLOWUP_REPLIES = {
+    "en": ("{name} costs {price} RON.", "{name}.", " Would you like to order it?"),
+    "ro": ("{name} costă {price} RON.", "{name}.", " Doriți să îl comandați?"),
+}
+
+def resolve_followup(state: Optional[Dict[str, Any]], user_message: str, language: Optional[str] = "en") -> Optional[Dict[str, Any]]:
+    """Answer a short follow-up like "the second one" from the previous turn's products
+
+    Only used when the message points at exactly one earlier product; anything
+    else goes through the full intent pipeline. The reply is in ``language``,
+    falling back to English.
+    """
+    if not state or not state.get("products"):
+        return None
+    message = " ".join(re.sub(r"[^\w' ]", " ", user_message.lower()).split())
+    products = state["products"]
+    match = _ORDINAL_FOLLOWUP.match(message)
+    if match:
+        ordinal = _ORDINALS[match.group("ordinal")]
+        if not -len(products) <= ordinal < len(products):
+            return None
+        product = products[ordinal]
+    elif len(products) == 1 and _CONFIRM_FOLLOWUP.match(message):
+        product = products[0]
+    else:
+        return None
+    with_price, without_price, question = _FOLLOWUP_REPLIES.get(language or "en", _FOLLOWUP_REPLIES["en"])
+    template = with_price if product.get("price") else without_price
+    return {
+        "intent": state.get("intent", {}),
+        "products": [product],
+        "response": template.format(name=product.get("name", ""), price=product.get("price")) + question,
+        "location": state.get("location")
+    }
 
 # Mall delivery locations endpoint
 @app.get("/mall-delivery-locations")
-async def get_mall_delivery_locations():
+def get_mall_delivery_locations(request: Request):
     """Get all available mall delivery locations"""
     try:
-        locations = location_service.get_locations_by_service("mall_delivery")
-        return {"locations": locations}
+        return cached_json_response(
+            request,
+            ("mall-delivery-locations",),
+            lambda: {"locations": location_service.get_locations_by_service("mall_delivery")}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-product_service = ProductService(woocommerce_service=enhanced_woocommerce_service)
-
-from app.services.whisper_service import WhisperService
+from app.services.whisper_service import WhisperService, CHUNK_SIZE as AUDIO_CHUNK_SIZE
 
-# Initialize Whisper service
-whisper_service = WhisperService()
+# Whisper service, created on the first /transcribe call rather than at import
+@lru_cache(maxsize=1)
+def get_whisper_service() -> WhisperService:
+    return WhisperService()
 
 class Location(BaseModel):
     latitude: float
@@ -160,7 +388,75 @@ async def chat(chat_message: ChatMessage):
         }
     except Exception as e:
 =======
-@app.post("/chat", response_model=ChatResponse)
+# At most this many /chat messages run the embedding + intent pipeline at once;
+# others wait up to CHAT_QUEUE_TIMEOUT seconds for a slot and then get a 503
+CHAT_CONCURRENCY = 64
+CHAT_QUEUE_TIMEOUT = 2.0
+_chat_slots = asyncio.Semaphore(CHAT_CONCURRENCY)
+# Pipeline runs in progress by message; identical messages arriving meanwhile
+# await the same run. Entries are removed as soon as the run finishes.
+_inflight_intents: Dict[str, asyncio.Task] = {}
+
+async def run_intent_pipeline(user_message: str) -> Dict[str, Any]:
+    """Run the intent pipeline for a message, sharing one run among concurrent identical messages
+
+    The run is shielded, so a client disconnecting doesn't cancel it for the
+    others waiting on it. Callers must not modify the returned dict.
+    """
+    task = _inflight_intents.get(user_message)
+    if task is None:
+        task = asyncio.ensure_future(_run_intent_pipeline(user_message))
+        _inflight_intents[user_message] = task
+        task.add_done_callback(lambda done: _finish_intent_run(user_message, done))
+    return await asyncio.shield(task)
+
+def _finish_intent_run(user_message: str, task: asyncio.Task) -> None:
+    _inflight_intents.pop(user_message, None)
+    # Mark a failure as retrieved even when every waiter was cancelled; waiters
+    # still awaiting the shield get it raised as usual
+    if not task.cancelled():
+        task.exception()
+
+def _release_if_acquired(acquire: asyncio.Future) -> None:
+    if not acquire.cancelled() and acquire.exception() is None:
+        _chat_slots.release()
+
+async def _acquire_chat_slot() -> bool:
+    """Wait up to CHAT_QUEUE_TIMEOUT for a /chat slot, returning False on timeout
+
+    asyncio.wait_for before Python 3.12 can leak a permit that is granted just
+    as the timeout fires; here an acquire that completes after being given up
+    on releases its permit again.
+    """
+    acquire = asyncio.ensure_future(_chat_slots.acquire())
+    try:
+        await asyncio.wait({acquire}, timeout=CHAT_QUEUE_TIMEOUT)
+    finally:
+        if not acquire.done():
+            acquire.cancel()
+            acquire.add_done_callback(_release_if_acquired)
+    return acquire.done() and not acquire.cancelled()
+
+async def _run_intent_pipeline(user_message: str) -> Dict[str, Any]:
+    """Embed the message and run intent detection, reusing a near-identical earlier result"""
+    if not await _acquire_chat_slot():
+        raise HTTPException(status_code=503, detail="The assistant is busy, please try again shortly")
+    try:
+        query_embedding = await openai_service.embed_with_cache(user_message)
+        result = intent_cache.get(query_embedding) if query_embedding is not None else None
+        if result is None:
+            # Process message using AI-powered intent detection; its OpenAI and
+            # WooCommerce calls block, so keep them off the event loop
+            result = await run_in_threadpool(intent_detection_service.process_user_message, user_message)
+            if query_embedding is not None:
+                intent_cache.put(query_embedding, result)
+        return result
+    finally:
+        _chat_slots.release()
+
+# The body follows ChatResponse but is built as a dict, so FastAPI doesn't
+# re-validate and re-encode it through the model on every message
+@app.post("/chat", responses={200: {"model": ChatResponse}})
 async def chat(chat_message: ChatMessage):
     try:
         # Extract user message
@@ -169,30 +465,28 @@ async def chat(chat_message: ChatMessage):
         # Get conversation history if available
         conversation_history = chat_message.conversation_state.get('history', []) if chat_message.conversation_state else []
         
-        # Check if location is specified in the request
-        location = chat_message.location.city if chat_message.location else None
+        # Use the request's location, else an active city named in the message
+        location = chat_message.location.city if chat_message.location else location_service.find_city_in_text(user_message)
         
-        # Process message using AI-powered intent detection
-        result = intent_detection_service.process_user_message(user_message)
+        # A short follow-up about the previous turn's products needs no new lookup
+        conversation = conversation_store.get(chat_message.conversation_id)
+        result = resolve_followup(conversation, user_message, chat_message.language)
+        if result is None:
+            result = await run_intent_pipeline(user_message)
+            conversation_store.save(chat_message.conversation_id, {
+                "intent": result.get("intent", {}),
+                "products": result.get("products", []),
+                "location": result.get("location") or location
+            })
         
         # Get intent data
         intent_data = result.get('intent', {})
         primary_intent = intent_data.get('primary_intent', 'general_query')
         detected_location = intent_data.get('location') or location
         
-        # Get products based on the detected intent
+        # Get products based on the detected intent; only the first five names are sent
         products = result.get('products', [])
-        
-        # Format the products for display
-        formatted_products = []
-        for product in products:
-            formatted_products.append({
-                'id': product.get('id'),
-                'name': product.get('name', ''),
-                'description': product.get('description', ''),
-                'price': product.get('price', ''),
-                'image_url': product.get('images', [''])[0] if product.get('images') else None
-            })
+        service_names = [product.get('name', '') for product in products[:5]]
         
         # Determine if human assistance is needed
         requires_human = primary_intent == 'customer_support'
@@ -200,33 +494,38 @@ async def chat(chat_message: ChatMessage):
         # Get the AI-generated response
         response_text = result.get('response', 'I\'m sorry, I couldn\'t process your request.')
         
-        # Create the response
-        response = {
+        # Return in the ChatResponse shape
+        return DefaultJSONResponse(content={
             'response': response_text,
             'confidence': 0.9,
             'requires_human': requires_human,
-            'products': formatted_products,
-            'detected_intent': primary_intent,
-            'location': detected_location
-        }
-        
-        # Return in the expected format
-        return ChatResponse(
-            response=response_text,
-            confidence=0.9,
-            requires_human=requires_human,
-            services=[p['name'] for p in formatted_products[:5]] if formatted_products else None,
-            expecting='location' if not detected_location and products else None
-        )
+            'services': service_names or None,
+            'expecting': 'location' if not detected_location and products else None,
+            'action': None,
+            'date': None,
+            'time': None
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/transcribe")
-async def transcribe_audio(audio: UploadFile = File(...)):
+async def transcribe_audio(audio: UploadFile = File(...),
+                           whisper_service: WhisperService = Depends(get_whisper_service)):
     try:
-        # Transcribe the audio using Whisper
-        transcription = await whisper_service.transcribe_audio(audio.file)
+        # Stream the upload to disk in fixed-size chunks, then transcribe it
+        # with Whisper in the threadpool
+        suffix = os.path.splitext(audio.filename or "")[1] or ".wav"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_path = temp_file.name
+            while chunk := await audio.read(AUDIO_CHUNK_SIZE):
+                temp_file.write(chunk)
+        try:
+            transcription = await run_in_threadpool(whisper_service.transcribe_audio_path, temp_path)
+        finally:
+            os.unlink(temp_path)
         
         return {
             "status": "success",
@@ -400,7 +699,7 @@ async def request_operator(data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/sync-woocommerce")
-async def sync_woocommerce(force: bool = False):
+def sync_woocommerce(force: bool = False):
     """Manually trigger a sync of the WooCommerce data"""
     try:
         # Use the new sync_data method
@@ -417,16 +716,19 @@ async def sync_woocommerce(force: bool = False):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/products")
-async def get_products(category: Optional[str] = None):
+def get_products(request: Request, category: Optional[str] = None):
     """Get products from WooCommerce"""
     try:
-        products = woocommerce_service.get_products(category=category)
-        return {"products": products}
+        return cached_json_response(
+            request,
+            ("products", category),
+            lambda: {"products": woocommerce_service.get_products(category=category)}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/orders")
-async def create_order(order_data: Dict[str, Any]):
+def create_order(order_data: Dict[str, Any]):
     """Create a new order in WooCommerce"""
     try:
         result = order_service.create_order(order_data)
@@ -439,7 +741,7 @@ async def create_order(order_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/orders/{order_id}")
-async def get_order(order_id: int):
+def get_order(order_id: int):
     """Get order details by ID"""
     try:
         result = order_service.get_order(order_id)
@@ -452,7 +754,7 @@ async def get_order(order_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/orders/customer/{email}")
-async def get_customer_orders(email: str):
+def get_customer_orders(email: str):
     """Get orders for a specific customer"""
     try:
         result = order_service.get_customer_orders(email)
@@ -525,7 +827,7 @@ async def close_ticket(ticket_id: str, data: Dict[str, Any]):
 
 # Test endpoints for API features
 @app.get("/test/woocommerce")
-async def test_woocommerce():
+def test_woocommerce():
     try:
         # Test WooCommerce connection
         products = woocommerce_service.get_products(limit=5)
@@ -548,27 +850,19 @@ async def test_woocommerce():
 
 # Product endpoints
 @app.get("/api/products")
-async def get_all_products(category: Optional[str] = None, limit: int = 100):
+def get_all_products(request: Request, category: Optional[str] = None, limit: int = 100):
     """Get all products, optionally filtered by category"""
     try:
-        result = product_service.get_products(category=category, limit=limit)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/api/products/{product_id}")
-async def get_product(product_id: int):
-    """Get a specific product by ID"""
-    try:
-        result = product_service.get_product_by_id(product_id)
-        if result["status"] == "error":
-            raise HTTPException(status_code=404, detail=result["message"])
-        return result
+        return cached_json_response(
+            request,
+            ("api/products", category, limit),
+            lambda: product_service.get_products(category=category, limit=limit)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/products/search")
-async def search_products(query: str, category: Optional[str] = None, limit: int = 20):
+def search_products(query: str, category: Optional[str] = None, limit: int = 20):
     """Search for products by name or description"""
     try:
         result = product_service.search_products(query=query, category=category, limit=limit)
@@ -577,16 +871,15 @@ async def search_products(query: str, category: Optional[str] = None, limit: int
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/products/categories")
-async def get_product_categories():
+def get_product_categories(request: Request):
     """Get all product categories"""
     try:
-        result = product_service.get_product_categories()
-        return result
+        return cached_json_response(request, ("api/products/categories",), product_service.get_product_categories)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/products/featured")
-async def get_featured_products(limit: int = 10):
+def get_featured_products(limit: int = 10):
     """Get featured products"""
     try:
         result = product_service.get_featured_products(limit=limit)
@@ -595,7 +888,7 @@ async def get_featured_products(limit: int = 10):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/products/sale")
-async def get_on_sale_products(limit: int = 10):
+def get_on_sale_products(limit: int = 10):
     """Get products that are on sale"""
     try:
         result = product_service.get_on_sale_products(limit=limit)
@@ -604,7 +897,7 @@ async def get_on_sale_products(limit: int = 10):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/products/reviews")
-async def get_product_reviews(product_id: Optional[int] = None):
+def get_product_reviews(product_id: Optional[int] = None):
     """Get product reviews, optionally filtered by product ID"""
     try:
         result = product_service.get_product_reviews(product_id=product_id)
@@ -612,9 +905,21 @@ async def get_product_reviews(product_id: Optional[int] = None):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Declared after the fixed /api/products/* paths, which it would otherwise capture
+@app.get("/api/products/{product_id}")
+def get_product(product_id: int):
+    """Get a specific product by ID"""
+    try:
+        result = product_service.get_product_by_id(product_id)
+        if result["status"] == "error":
+            raise HTTPException(status_code=404, detail=result["message"])
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Customer endpoints
 @app.post("/api/customers")
-async def create_customer(customer_data: Dict[str, Any]):
+def create_customer(customer_data: Dict[str, Any]):
     """Create a new customer"""
     try:
         result = customer_service.create_customer(customer_data)
@@ -625,7 +930,7 @@ async def create_customer(customer_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/customers/{customer_id}")
-async def get_customer(customer_id: int):
+def get_customer(customer_id: int):
     """Get a specific customer by ID"""
     try:
         result = customer_service.get_customer(customer_id)
@@ -636,7 +941,7 @@ async def get_customer(customer_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/customers/email/{email}")
-async def get_customer_by_email(email: str):
+def get_customer_by_email(email: str):
     """Get a specific customer by email"""
     try:
         result = customer_service.get_customer_by_email(email)
@@ -647,7 +952,7 @@ async def get_customer_by_email(email: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/customers/{customer_id}")
-async def update_customer(customer_id: int, customer_data: Dict[str, Any]):
+def update_customer(customer_id: int, customer_data: Dict[str, Any]):
     """Update a customer"""
     try:
         result = customer_service.update_customer(customer_id, customer_data)
@@ -658,7 +963,7 @@ async def update_customer(customer_id: int, customer_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/customers/{customer_id}/address")
-async def add_customer_address(customer_id: int, address_data: Dict[str, Any], address_type: str = "billing"):
+def add_customer_address(customer_id: int, address_data: Dict[str, Any], address_type: str = "billing"):
     """Add a new address to a customer"""
     try:
         result = customer_service.add_customer_address(customer_id, address_data, address_type)
@@ -670,7 +975,7 @@ async def add_customer_address(customer_id: int, address_data: Dict[str, Any], a
 
 # Enhanced Order endpoints
 @app.post("/api/orders")
-async def create_enhanced_order(order_data: Dict[str, Any]):
+def create_enhanced_order(order_data: Dict[str, Any]):
     """Create a new order using the enhanced order service"""
     try:
         result = enhanced_order_service.create_order(order_data)
@@ -681,7 +986,7 @@ async def create_enhanced_order(order_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/orders/{order_id}")
-async def get_enhanced_order(order_id: int):
+def get_enhanced_order(order_id: int):
     """Get order details by ID using the enhanced order service"""
     try:
         result = enhanced_order_service.get_order(order_id)
@@ -692,7 +997,7 @@ async def get_enhanced_order(order_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/orders/customer/{customer_id}")
-async def get_customer_enhanced_orders(customer_id: int):
+def get_customer_enhanced_orders(customer_id: int):
     """Get orders for a specific customer using the enhanced order service"""
     try:
         result = enhanced_order_service.get_customer_orders(customer_id)
@@ -703,7 +1008,7 @@ async def get_customer_enhanced_orders(customer_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/orders/email/{email}")
-async def get_customer_orders_by_email(email: str):
+def get_customer_orders_by_email(email: str):
     """Get orders for a customer by email using the enhanced order service"""
     try:
         result = enhanced_order_service.get_customer_orders_by_email(email)
@@ -714,7 +1019,7 @@ async def get_customer_orders_by_email(email: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/orders/{order_id}/status")
-async def update_order_status(order_id: int, status: str):
+def update_order_status(order_id: int, status: str):
     """Update order status"""
     try:
         result = enhanced_order_service.update_order_status(order_id, status)
@@ -725,7 +1030,7 @@ async def update_order_status(order_id: int, status: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/orders/{order_id}/notes")
-async def add_order_note(order_id: int, note: str, is_customer_note: bool = False):
+def add_order_note(order_id: int, note: str, is_customer_note: bool = False):
     """Add a note to an order"""
     try:
         result = enhanced_order_service.add_order_note(order_id, note, is_customer_note)
@@ -736,7 +1041,7 @@ async def add_order_note(order_id: int, note: str, is_customer_note: bool = Fals
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/orders/{order_id}/cancel")
-async def cancel_order(order_id: int, reason: Optional[str] = None):
+def cancel_order(order_id: int, reason: Optional[str] = None):
     """Cancel an order"""
     try:
         result = enhanced_order_service.cancel_order(order_id, reason)
@@ -747,7 +1052,7 @@ async def cancel_order(order_id: int, reason: Optional[str] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/coupons/validate")
-async def validate_coupon(code: str):
+def validate_coupon(code: str):
     """Validate a coupon code"""
     try:
         result = enhanced_order_service.validate_coupon(code)
@@ -757,16 +1062,19 @@ async def validate_coupon(code: str):
 
 # Shipping and Payment endpoints
 @app.get("/api/shipping/methods")
-async def get_shipping_methods():
+def get_shipping_methods(request: Request):
     """Get available shipping methods"""
     try:
-        methods = enhanced_woocommerce_service.get_shipping_methods()
-        return {"status": "success", "methods": methods}
+        return cached_json_response(
+            request,
+            ("api/shipping/methods",),
+            enhanced_woocommerce_service.get_shipping_methods
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/shipping/zones")
-async def get_shipping_zones():
+def get_shipping_zones():
     """Get shipping zones"""
     try:
         zones = enhanced_woocommerce_service.get_shipping_zones()
@@ -775,17 +1083,20 @@ async def get_shipping_zones():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/payment/gateways")
-async def get_payment_gateways():
+def get_payment_gateways(request: Request):
     """Get available payment gateways"""
     try:
-        gateways = enhanced_woocommerce_service.get_payment_gateways()
-        return {"status": "success", "gateways": gateways}
+        return cached_json_response(
+            request,
+            ("api/payment/gateways",),
+            enhanced_woocommerce_service.get_payment_gateways
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Mall delivery product endpoints
 @app.get("/mall-delivery")
-async def get_mall_delivery_products(location: Optional[str] = None):
+def get_mall_delivery_products(location: Optional[str] = None):
     try:
         result = woocommerce_service.get_mall_delivery_services(location)
         return result
@@ -793,7 +1104,7 @@ async def get_mall_delivery_products(location: Optional[str] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/categories")
-async def get_categories():
+def get_categories():
     try:
         result = woocommerce_service.get_categories()
         return result
@@ -816,7 +1127,7 @@ async def test_intent_detection(data: Dict[str, Any]):
         if not user_message:
             raise HTTPException(status_code=400, detail="Message is required")
             
-        result = intent_detection_service.process_user_message(user_message)
+        result = await run_in_threadpool(intent_detection_service.process_user_message, user_message)
         return result
     except Exception as e:
         logger.error(f"Error in test-intent endpoint: {str(e)}")
@@ -824,4 +1135,7 @@ async def test_intent_detection(data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop and the httptools parser (uvicorn[standard]) instead of asyncio and h11;
+    # auto-reload only when DEV is set
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=bool(os.getenv("DEV")),
+                loop="uvloop", http="httptools")
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 import os
 import json
+import asyncio
 from dotenv import load_dotenv
-from app.services.product_service import ProductService
+from app.services.product_service import get_product_service
+from script_cache import acached_call
 
 # Load environment variables
 load_dotenv()
@@ -12,11 +14,11 @@ def print_section(title):
     print(f" {title} ".center(80, "="))
     print("="*80)
 
-def main():
+async def main():
     print_section("TESTING ENHANCED PRODUCT SEARCH")
     
     # Initialize product service
-    product_service = ProductService()
+    product_service = get_product_service()
     
     # Test search terms
     search_terms = [
@@ -29,13 +31,12 @@ def main():
         "antipasti"
     ]
     
-    # Test each search term
-    for term in search_terms:
+    # Run every search at once, then print the results in order
+    results = await asyncio.gather(*[acached_call("search_products", product_service.asearch_products, term, limit=5) for term in search_terms])
+    
+    for term, result in zip(search_terms, results):
         print_section(f"SEARCHING FOR: '{term}'")
         
-        # Search for products
-        result = product_service.search_products(term, limit=5)
-        
         if result.get("status") != "success":
             print(f"Error: {result.get('message', 'Unknown error')}")
             continue
@@ -101,4 +102,4 @@ def main():
                 print(f"   Categories: {', '.join(cats)}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""On-disk TTL cache for the product/slug tester scripts (product_search_tester.py, slug_analyzer.py, test_slugs.py)"""
+import atexit
+import json
+import os
+import sys
+import time
+
+# Results of earlier runs: key -> {"expires": unix time, "value": result}
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".script_cache.json")
+CACHE_TTL = 600
+# Passing this flag to a script drops everything cached by earlier runs
+REFRESH_FLAG = "--refresh"
+
+
+def _load():
+    if REFRESH_FLAG in sys.argv[1:]:
+        return {}
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {key: entry for key, entry in cache.items() if entry["expires"] > now}
+
+
+_cache = _load()
+_dirty = REFRESH_FLAG in sys.argv[1:]
+
+
+@atexit.register
+def _save():
+    if not _dirty:
+        return
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(_cache, f)
+
+
+def _key(name, args, kwargs):
+    return json.dumps([name, args, kwargs], sort_keys=True)
+
+
+def _lookup(key):
+    entry = _cache.get(key)
+    if entry is not None and entry["expires"] > time.time():
+        return True, entry["value"]
+    return False, None
+
+
+def _store(key, value):
+    global _dirty
+    if not (isinstance(value, dict) and value.get("status") == "error"):
+        _cache[key] = {"expires": time.time() + CACHE_TTL, "value": value}
+        _dirty = True
+    return value
+
+
+def cached_call(name, func, *args, **kwargs):
+    """Return ``func(*args, **kwargs)``, reusing the result of an earlier run for up to CACHE_TTL seconds
+
+    ``name`` and the arguments form the key, so they must be JSON-serializable.
+    Error results (``{"status": "error", ...}``) are not cached.
+    """
+    key = _key(name, args, kwargs)
+    hit, value = _lookup(key)
+    return value if hit else _store(key, func(*args, **kwargs))
+
+
+async def acached_call(name, func, *args, **kwargs):
+    """cached_call() for a coroutine function"""
+    key = _key(name, args, kwargs)
+    hit, value = _lookup(key)
+    return value if hit else _store(key, await func(*args, **kwargs))
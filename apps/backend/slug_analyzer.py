@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 import os
 import json
+import asyncio
 from dotenv import load_dotenv
-from app.services.enhanced_woocommerce_service import EnhancedWooCommerceService
-from app.services.product_service import ProductService
+from app.services.enhanced_woocommerce_service import get_enhanced_woocommerce_service
+from app.services.product_service import get_product_service
+from script_cache import cached_call, acached_call
+from slug_report import build_term_matcher, column_term_matches, product_columns
 
 # Load environment variables
 load_dotenv()
@@ -13,16 +16,16 @@ def print_section(title):
     print(f" {title} ".center(80, "="))
     print("="*80)
 
-def main():
+async def main():
     # Initialize services
-    woo_service = EnhancedWooCommerceService()
-    product_service = ProductService()
+    woo_service = get_enhanced_woocommerce_service()
+    product_service = get_product_service()
     
     print_section("TESTING CATEGORY SLUGS")
     
     # Get categories using ProductService
     print("Fetching categories...")
-    categories_result = product_service.get_product_categories()
+    categories_result = cached_call("get_product_categories", product_service.get_product_categories)
     
     if isinstance(categories_result, dict) and categories_result.get("status") == "error":
         print(f"Error: {categories_result.get('message')}")
@@ -44,7 +47,7 @@ def main():
     
     # Get products using ProductService
     print("Fetching products...")
-    products_result = product_service.get_products(limit=10)
+    products_result = cached_call("get_products", product_service.get_products, limit=10)
     
     if products_result.get("status") == "error":
         print(f"Error: {products_result.get('message')}")
@@ -56,51 +59,58 @@ def main():
         print("No products found!")
     else:
         print(f"Found {len(products)} products")
-        for i, product in enumerate(products[:5], 1):  # Show first 5
-            print(f"\n{i}. Product: {product.get('name', 'Unknown')}")
+        shown = products[:5]  # Show first 5
+        columns = product_columns(shown)
+        for i, product in enumerate(shown):
+            print(f"\n{i + 1}. Product: {columns['names'][i] or 'Unknown'}")
             print(f"   - ID: {product.get('id')}")
-            print(f"   - Slug: {product.get('slug', 'No slug')}")
-            print(f"   - Categories: {', '.join([c.get('name', 'Unknown') for c in product.get('categories', [])])}")
+            print(f"   - Slug: {columns['slugs'][i] or 'No slug'}")
+            print(f"   - Categories: {', '.join(columns['cat_names'][i])}")
             
             # Show category slugs for this product
-            cat_slugs = [c.get('slug', 'Unknown') for c in product.get('categories', [])]
-            print(f"   - Category Slugs: {', '.join(cat_slugs)}")
+            print(f"   - Category Slugs: {', '.join(s or 'Unknown' for s in columns['cat_slugs'][i])}")
     
     print_section("TESTING BASIC SEARCH")
     
     # Test search terms - focus on terms that might match slugs
     search_terms = ["pizza", "auto", "bio", "mall", "antipasti"]
     
-    for term in search_terms:
+    match_terms = build_term_matcher(search_terms)
+    
+    # Run every search at once, then print the results in order
+    all_results = await asyncio.gather(*[acached_call("search_products", product_service.asearch_products, term) for term in search_terms])
+    
+    # Match the terms against each shown product (first 3 per search) once, up front
+    shown = [product_columns(results.get("products", [])[:3]) for results in all_results]
+    matches = [column_term_matches(columns, match_terms) for columns in shown]
+    
+    for term, results, columns, found in zip(search_terms, all_results, shown, matches):
         print(f"\nSearching for '{term}'...")
         
-        # Current search functionality
-        results = product_service.search_products(term)
-        
         if results.get("status") == "success":
             products_found = results.get("products", [])
             print(f"Found {len(products_found)} products")
             
-            for i, product in enumerate(products_found[:3], 1):  # Show first 3
-                print(f"\n{i}. Product: {product.get('name', 'Unknown')}")
+            for i, name in enumerate(columns['names']):
+                print(f"\n{i + 1}. Product: {name or 'Unknown'}")
                 
                 # Check if term is in name
-                name = product.get('name', '').lower()
-                if term.lower() in name:
+                name = name.lower()
+                if term in found['names'][i]:
                     print(f"   - MATCH IN NAME: '{term}' found in '{name}'")
                 
                 # Check if term is in slug
-                slug = product.get('slug', '').lower()
+                slug = columns['slugs'][i].lower()
                 print(f"   - Slug: {slug}")
-                if term.lower() in slug:
+                if term in found['slugs'][i]:
                     print(f"   - MATCH IN SLUG: '{term}' found in '{slug}'")
                 else:
                     print(f"   - NO MATCH in slug")
                 
                 # Check category slugs
-                cat_slugs = [c.get('slug', '').lower() for c in product.get('categories', [])]
+                cat_slugs = [s.lower() for s in columns['cat_slugs'][i]]
                 print(f"   - Category Slugs: {', '.join(cat_slugs)}")
-                matching_cats = [s for s in cat_slugs if term.lower() in s]
+                matching_cats = [s for s, terms in zip(cat_slugs, found['cat_slugs'][i]) if term in terms]
                 if matching_cats:
                     print(f"   - MATCH IN CATEGORY SLUGS: '{term}' found in {', '.join(matching_cats)}")
                 else:
@@ -111,4 +121,4 @@ def main():
     print_section("COMPLETE")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+"""Report helpers shared by the slug scripts (slug_analyzer.py, test_slugs.py)"""
+try:
+    import ahocorasick
+except ImportError:  # optional; terms are then checked one by one
+    ahocorasick = None
+
+
+def build_term_matcher(terms):
+    """Return a function giving the set of terms a text contains (case-insensitive)
+    
+    With pyahocorasick installed every term is found in one pass over the text.
+    """
+    lowered = {term.lower(): term for term in terms}
+    if ahocorasick is None:
+        return lambda text: {term for key, term in lowered.items() if key in text.lower()}
+    automaton = ahocorasick.Automaton()
+    for key, term in lowered.items():
+        automaton.add_word(key, term)
+    automaton.make_automaton()
+    return lambda text: {term for _, term in automaton.iter(text.lower())}
+
+
+def product_columns(products):
+    """Pull the fields the report prints out of each product once, as parallel lists"""
+    categories = [product.get('categories', []) for product in products]
+    return {
+        "names": [product.get('name', '') for product in products],
+        "slugs": [product.get('slug', '') for product in products],
+        "cat_names": [[c.get('name', 'Unknown') for c in cats] for cats in categories],
+        "cat_slugs": [[c.get('slug', '') for c in cats] for cats in categories],
+    }
+
+
+def column_term_matches(columns, match_terms):
+    """Run match_terms once over every name, slug and category slug in product_columns() output"""
+    return {
+        "names": [match_terms(name) for name in columns["names"]],
+        "slugs": [match_terms(slug) for slug in columns["slugs"]],
+        "cat_slugs": [[match_terms(s) for s in cat_slugs] for cat_slugs in columns["cat_slugs"]],
+    }
@@ -4,12 +4,26 @@ import os
 import base64
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# One session for every request so the connection to the API is reused
+SESSION = requests.Session()
+
+def pretty_json(response):
+    """Decode a JSON response and format it for printing, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(orjson.loads(response.content), option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(response.json(), indent=2)
+
 def test_chat_endpoint():
     """Test the chat endpoint"""
     print("\n=== Testing Chat Endpoint ===")
@@ -21,11 +35,11 @@ def test_chat_endpoint():
     }
     
     # Send request
-    response = requests.post(f"{BASE_URL}/api/mobile/chat", json=data)
+    response = SESSION.post(f"{BASE_URL}/api/mobile/chat", json=data)
     
     # Print response
     print(f"Status code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {pretty_json(response)}")
     
     return response.json()
 
@@ -40,18 +54,18 @@ def test_shopping_list_endpoints():
     }
     
     # Send request to add item
-    add_response = requests.post(f"{BASE_URL}/api/mobile/shopping-list", json=add_data)
+    add_response = SESSION.post(f"{BASE_URL}/api/mobile/shopping-list", json=add_data)
     
     # Print response
     print(f"Add item status code: {add_response.status_code}")
-    print(f"Add item response: {json.dumps(add_response.json(), indent=2)}")
+    print(f"Add item response: {pretty_json(add_response)}")
     
     # Test getting the shopping list
-    get_response = requests.get(f"{BASE_URL}/api/mobile/shopping-list?list_name=groceries")
+    get_response = SESSION.get(f"{BASE_URL}/api/mobile/shopping-list?list_name=groceries")
     
     # Print response
     print(f"Get list status code: {get_response.status_code}")
-    print(f"Get list response: {json.dumps(get_response.json(), indent=2)}")
+    print(f"Get list response: {pretty_json(get_response)}")
     
     return get_response.json()
 
@@ -69,18 +83,18 @@ def test_calendar_endpoints():
     }
     
     # Send request to add event
-    add_response = requests.post(f"{BASE_URL}/api/mobile/calendar", json=add_data)
+    add_response = SESSION.post(f"{BASE_URL}/api/mobile/calendar", json=add_data)
     
     # Print response
     print(f"Add event status code: {add_response.status_code}")
-    print(f"Add event response: {json.dumps(add_response.json(), indent=2)}")
+    print(f"Add event response: {pretty_json(add_response)}")
     
     # Test getting calendar events
-    get_response = requests.get(f"{BASE_URL}/api/mobile/calendar")
+    get_response = SESSION.get(f"{BASE_URL}/api/mobile/calendar")
     
     # Print response
     print(f"Get events status code: {get_response.status_code}")
-    print(f"Get events response: {json.dumps(get_response.json(), indent=2)}")
+    print(f"Get events response: {pretty_json(get_response)}")
     
     return get_response.json()
 
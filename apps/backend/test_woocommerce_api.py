@@ -1,8 +1,14 @@
-import requests
+import httpx
 import json
 import os
+import asyncio
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -11,20 +17,42 @@ WP_API_URL = os.getenv("WP_API_URL", "https://vogo.family/wp-json/")
 WP_CONSUMER_KEY = os.getenv("WP_CONSUMER_KEY")
 WP_CONSUMER_SECRET = os.getenv("WP_CONSUMER_SECRET")
 
-def test_endpoint(endpoint, method="GET", data=None):
-    """Test a WooCommerce API endpoint"""
+# explore_api() results, one JSON record per endpoint
+API_DOCS_PATH = "woocommerce_api_docs.ndjson"
+
+def dump_line(record):
+    """Encode a record as one compact NDJSON line"""
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def make_client():
+    """One HTTP/2 client for every endpoint, so requests share a single connection to the store"""
+    return httpx.AsyncClient(
+        base_url=f"{WP_API_URL}wc/v3/",
+        auth=(WP_CONSUMER_KEY, WP_CONSUMER_SECRET),
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        timeout=30.0
+    )
+
+async def request_endpoint(client, endpoint, method="GET", data=None):
+    """Send a request to a WooCommerce API endpoint"""
+    if method == "GET":
+        return await client.get(endpoint)
+    elif method == "POST":
+        return await client.post(endpoint, json=data)
+    raise ValueError(f"Unsupported method: {method}")
+
+def report_endpoint(endpoint, response, method="GET"):
+    """Print the outcome of request_endpoint(), returning the response (None on error)"""
     url = f"{WP_API_URL}wc/v3/{endpoint}"
     
-    # Add authentication
-    auth = (WP_CONSUMER_KEY, WP_CONSUMER_SECRET)
-    
     print(f"\n=== Testing {method} {url} ===")
     
     try:
-        if method == "GET":
-            response = requests.get(url, auth=auth)
-        elif method == "POST":
-            response = requests.post(url, json=data, auth=auth)
+        if isinstance(response, Exception):
+            raise response
         
         print(f"Status code: {response.status_code}")
         if response.status_code == 200:
@@ -38,7 +66,7 @@ def test_endpoint(endpoint, method="GET", data=None):
         print(f"Error: {str(e)}")
         return None
 
-def explore_api():
+async def explore_api(client):
     """Explore available WooCommerce API endpoints"""
     
     # Test basic endpoints
@@ -56,50 +84,56 @@ def explore_api():
         "webhooks"
     ]
     
-    results = {}
+    # Hit every endpoint at once, then report them in order
+    responses = await asyncio.gather(*[request_endpoint(client, endpoint) for endpoint in endpoints],
+                                     return_exceptions=True)
     
-    for endpoint in endpoints:
-        print(f"\nTesting endpoint: {endpoint}")
-        response = test_endpoint(endpoint)
-        if response:
-            results[endpoint] = {
-                "status_code": response.status_code,
-                "response": response.json() if response.status_code == 200 else response.text
-            }
-    
-    # Save results to file
-    with open("woocommerce_api_docs.json", "w") as f:
-        json.dump(results, f, indent=2)
-        print("\nResults saved to woocommerce_api_docs.json")
+    # Each record is written as soon as it is reported, so only one decoded
+    # response body is held at a time
+    with open(API_DOCS_PATH, "wb", buffering=65536) as f:
+        for i, endpoint in enumerate(endpoints):
+            print(f"\nTesting endpoint: {endpoint}")
+            response = report_endpoint(endpoint, responses[i])
+            responses[i] = None
+            if response:
+                f.write(dump_line({
+                    "endpoint": endpoint,
+                    "status_code": response.status_code,
+                    "response": response.json() if response.status_code == 200 else response.text
+                }))
+    print(f"\nResults saved to {API_DOCS_PATH}")
 
-def test_specific_endpoints():
+async def test_specific_endpoints(client):
     """Test specific endpoints that might be relevant for the mall delivery service"""
     
-    # Test product categories
-    print("\nTesting product categories...")
-    test_endpoint("products/categories")
-    
-    # Test products with category filter
-    print("\nTesting products with category filter...")
-    test_endpoint("products?category=restaurants")
-    
-    # Test products with location filter
-    print("\nTesting products with location filter...")
-    test_endpoint("products?tag=alba-iulia")
-    
-    # Test custom endpoints if any
-    print("\nTesting custom endpoints...")
-    custom_endpoints = [
-        "mall-delivery/locations",
-        "mall-delivery/restaurants",
-        "mall-delivery/orders"
+    checks = [
+        # Test product categories
+        ("Testing product categories...", "products/categories"),
+        # Test products with category filter
+        ("Testing products with category filter...", "products?category=restaurants"),
+        # Test products with location filter
+        ("Testing products with location filter...", "products?tag=alba-iulia"),
+        # Test custom endpoints if any
+        ("Testing custom endpoints...", "mall-delivery/locations"),
+        (None, "mall-delivery/restaurants"),
+        (None, "mall-delivery/orders")
     ]
     
-    for endpoint in custom_endpoints:
-        test_endpoint(endpoint)
+    # Send every request at once, then report them in order
+    responses = await asyncio.gather(*[request_endpoint(client, endpoint) for _, endpoint in checks],
+                                     return_exceptions=True)
+    
+    for (title, endpoint), response in zip(checks, responses):
+        if title:
+            print(f"\n{title}")
+        report_endpoint(endpoint, response)
+
+async def main():
+    async with make_client() as client:
+        print("Starting WooCommerce API exploration...")
+        await explore_api(client)
+        print("\nTesting specific endpoints...")
+        await test_specific_endpoints(client)
 
 if __name__ == "__main__":
-    print("Starting WooCommerce API exploration...")
-    explore_api()
-    print("\nTesting specific endpoints...")
-    test_specific_endpoints()
+    asyncio.run(main())
@@ -1,29 +1,120 @@
 #!/usr/bin/env python3
 import os
 import json
-import requests
+import asyncio
+import httpx
 import logging
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from collections import defaultdict
+from functools import lru_cache
+from importlib.util import find_spec
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urldefrag, urljoin, urlparse
 from pprint import pprint
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Pages fetched at once; the client's keep-alive pool is sized to match (HTTP/1.1 fallback)
+MAX_CONCURRENT_FETCHES = 16
+
+# Compressed transfer encodings to ask for; br only when a Brotli decoder is installed
+ACCEPT_ENCODING = ', '.join(['gzip', 'deflate'] + (['br'] if any(find_spec(m) for m in ('brotli', 'brotlicffi')) else []))
+
+# Transient responses retried by fetch_page, with exponential backoff unless Retry-After says otherwise
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.3
+
+# scrape_products() output, one JSON record per product
+PRODUCTS_FILE = "scraped_products.jsonl"
+
+def dump_line(record):
+    """Encode a record as one compact NDJSON line"""
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+@lru_cache(maxsize=1024)
+def url_slug(url):
+    """Last path segment of a URL, ignoring a trailing slash (category links repeat across products)"""
+    return urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+
 class VogoWebScraper:
     """Scraper for extracting product data from vogo.family website"""
     
+    # CSS selectors, built once for the class rather than per page
+    # Grouped selectors for the link patterns WooCommerce themes use
+    _PRODUCT_LINK_SELECTOR = ', '.join([
+        '.product a.woocommerce-loop-product__link',
+        '.product a.woocommerce-LoopProduct-link',
+        '.products .product a',
+        'li.product a',
+        'a.product_type_simple',
+    ])
+    _CATEGORY_LINK_SELECTOR = ', '.join([
+        '.product-category a',
+        '.product-categories a',
+        'li.cat-item a',
+        '.wc-block-product-categories-list a',
+    ])
+    # Every product page node extract_product_details reads, matched in one pass
+    _PRODUCT_DETAIL_SELECTOR = ', '.join([
+        '.product_title',
+        '.price',
+        '.woocommerce-product-details__short-description',
+        '#tab-description',
+        '.woocommerce-Tabs-panel--description',
+        '.posted_in a',
+        '.woocommerce-product-gallery__image img',
+        '.woocommerce-product-attributes-item',
+    ])
+    # Single-valued product fields, keyed by the class that marks their node
+    _PRODUCT_FIELD_CLASSES = {
+        'product_title': 'name',
+        'price': 'price',
+        'woocommerce-product-details__short-description': 'short_description',
+        'woocommerce-Tabs-panel--description': 'description',
+    }
+    _ATTRIBUTE_ROW_CLASS = 'woocommerce-product-attributes-item'
+    # Gallery image URL attributes, full-size first; lazy-loaded galleries leave src empty
+    _IMAGE_URL_ATTRIBUTES = ('data-large_image', 'data-src', 'src')
+    _ATTRIBUTE_LABEL_SELECTOR = '.woocommerce-product-attributes-item__label'
+    _ATTRIBUTE_VALUE_SELECTOR = '.woocommerce-product-attributes-item__value'
+    _CATEGORY_NAME_SELECTOR = '.woocommerce-products-header__title'
+    _CATEGORY_NAME_FALLBACK_SELECTOR = 'h1.page-title'
+    _CATEGORY_DESCRIPTION_SELECTOR = '.term-description'
+    _MENU_LINK_SELECTOR = '.menu-item a, nav a, #menu-main-menu a'
+    
     def __init__(self, base_url="https://vogo.family"):
         """Initialize the scraper"""
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5'
-        })
+        self.client = httpx.AsyncClient(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': ACCEPT_ENCODING
+            },
+            # Multiplex the page fetches over HTTP/2 when the server offers it (httpx[http2]),
+            # and retry failed connection attempts inside the transport
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=2 * MAX_CONCURRENT_FETCHES,
+                                    max_keepalive_connections=MAX_CONCURRENT_FETCHES,
+                                    keepalive_expiry=30)
+            ),
+            follow_redirects=True,
+            timeout=30.0
+        )
+        self._fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
         
         # Create output directory
         self.output_dir = "scraped_data"
@@ -31,11 +122,19 @@ class VogoWebScraper:
         
         logger.info(f"Initialized scraper for {self.base_url}")
     
+    async def aclose(self):
+        """Close the HTTP client's connections"""
+        await self.client.aclose()
+    
     def save_json(self, data, filename):
         """Save data to a JSON file"""
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         logger.info(f"Saved data to {filepath}")
         return filepath
     
@@ -43,213 +142,205 @@ class VogoWebScraper:
         """Get full URL from path"""
         return urljoin(self.base_url, url_path)
     
-    def fetch_page(self, url_path):
-        """Fetch a page and return the BeautifulSoup object"""
+    def canonical_url(self, href):
+        """Absolute URL without its #fragment, so one page linked several ways is fetched once"""
+        return urldefrag(self.get_url(href)).url
+    
+    async def fetch_page(self, url_path):
+        """Fetch a page and return its parsed Lexbor tree"""
         url = self.get_url(url_path)
         try:
             logger.info(f"Fetching {url}")
-            response = self.session.get(url)
+            for attempt in range(MAX_RETRIES + 1):
+                # Hold a slot only for the request itself, so waiting out a
+                # Retry-After doesn't keep other fetches from running
+                async with self._fetch_slots:
+                    response = await self.client.get(url)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    break
+                retry_after = response.headers.get('Retry-After', '')
+                delay = int(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt
+                logger.warning(f"Got {response.status_code} for {url}, retrying in {delay}s")
+                await asyncio.sleep(delay)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            # Hand Lexbor the decompressed bytes; it sniffs the charset itself, so no str is built
+            return LexborHTMLParser(response.content)
         except Exception as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             return None
     
-    def extract_product_links(self, soup):
-        """Extract product links from a page"""
-        product_links = []
-        
-        # Try to find product links - look for common WooCommerce patterns
-        # Method 1: Look for product links in WooCommerce product grids
-        products = soup.select('.product a.woocommerce-loop-product__link')
-        if not products:
-            products = soup.select('.product a.woocommerce-LoopProduct-link')
-        if not products:
-            products = soup.select('.products .product a')
-        if not products:
-            products = soup.select('li.product a')
-        if not products:
-            products = soup.select('a.product_type_simple')
-        
-        for product in products:
-            href = product.get('href')
-            if href and '/product/' in href:
-                product_links.append(href)
+    def extract_product_links(self, tree):
+        """Extract the set of unique product links on a page"""
+        # Common WooCommerce product grid patterns, matched in a single pass over the tree
+        products = tree.css(self._PRODUCT_LINK_SELECTOR)
         
-        # Remove duplicates
-        product_links = list(set(product_links))
+        # Collect into a set as we go, so duplicates never materialize
+        product_links = {self.canonical_url(href) for href in (p.attributes.get('href') for p in products)
+                         if href and '/product/' in href}
         
         logger.info(f"Found {len(product_links)} product links")
         return product_links
     
-    def extract_category_links(self, soup):
-        """Extract category links from a page"""
-        category_links = []
-        
-        # Method 1: Look for category links in WooCommerce category lists
-        categories = soup.select('.product-category a')
-        if not categories:
-            categories = soup.select('.product-categories a')
-        if not categories:
-            categories = soup.select('li.cat-item a')
-        if not categories:
-            categories = soup.select('.wc-block-product-categories-list a')
-            
-        for category in categories:
-            href = category.get('href')
-            if href and '/product-category/' in href:
-                category_links.append(href)
+    def extract_category_links(self, tree):
+        """Extract the set of unique category links on a page"""
+        # Common WooCommerce category list patterns, matched in a single pass over the tree
+        categories = tree.css(self._CATEGORY_LINK_SELECTOR)
         
-        # Remove duplicates
-        category_links = list(set(category_links))
+        # Collect into a set as we go, so duplicates never materialize
+        category_links = {self.canonical_url(href) for href in (c.attributes.get('href') for c in categories)
+                          if href and '/product-category/' in href}
         
         logger.info(f"Found {len(category_links)} category links")
         return category_links
     
-    def extract_product_details(self, soup, url):
+    def extract_product_details(self, tree, url):
         """Extract product details from a product page"""
         product = {
             'url': url,
-            'slug': urlparse(url).path.split('/')[-2] if urlparse(url).path.endswith('/') else urlparse(url).path.split('/')[-1]
+            'slug': url_slug(url)
         }
         
-        # Extract product name
-        product_name = soup.select_one('.product_title')
-        if product_name:
-            product['name'] = product_name.text.strip()
-        
-        # Extract product price
-        product_price = soup.select_one('.price')
-        if product_price:
-            product['price'] = product_price.text.strip()
-        
-        # Extract product description
-        product_short_desc = soup.select_one('.woocommerce-product-details__short-description')
-        if product_short_desc:
-            product['short_description'] = product_short_desc.text.strip()
-        
-        product_desc = soup.select_one('#tab-description')
-        if product_desc:
-            product['description'] = product_desc.text.strip()
-        elif soup.select_one('.woocommerce-Tabs-panel--description'):
-            product['description'] = soup.select_one('.woocommerce-Tabs-panel--description').text.strip()
-        
-        # Extract product categories
+        fields = {}
         product_cats = []
-        cat_links = soup.select('.posted_in a')
-        for cat_link in cat_links:
-            cat_url = cat_link.get('href')
-            cat_name = cat_link.text.strip()
-            cat_slug = urlparse(cat_url).path.split('/')[-2] if urlparse(cat_url).path.endswith('/') else urlparse(cat_url).path.split('/')[-1]
-            product_cats.append({
-                'name': cat_name,
-                'slug': cat_slug,
-                'url': cat_url
-            })
-        
-        product['categories'] = product_cats
-        
-        # Extract product images
         product_images = []
-        img_elements = soup.select('.woocommerce-product-gallery__image img')
-        for img in img_elements:
-            img_url = img.get('src') or img.get('data-src') or img.get('data-large_image')
-            if img_url:
-                product_images.append(img_url)
+        attributes = {}
         
-        product['images'] = product_images
+        # Walk the matched nodes once, in document order, routing each by its class or tag;
+        # the first node for a single-valued field wins, as css_first() would pick
+        for node in tree.css(self._PRODUCT_DETAIL_SELECTOR):
+            node_attrs = node.attributes
+            classes = (node_attrs.get('class') or '').split()
+            field = next((self._PRODUCT_FIELD_CLASSES[c] for c in classes if c in self._PRODUCT_FIELD_CLASSES), None)
+            if field is None and node_attrs.get('id') == 'tab-description':
+                field = 'description'
+            
+            if field is not None:
+                fields.setdefault(field, node)
+            elif self._ATTRIBUTE_ROW_CLASS in classes:
+                # Extract product attributes
+                label = node.css_first(self._ATTRIBUTE_LABEL_SELECTOR)
+                value = node.css_first(self._ATTRIBUTE_VALUE_SELECTOR)
+                if label is not None and value is not None:
+                    key = label.text().strip().rstrip(':')
+                    attributes[key] = value.text().strip()
+            elif node.tag == 'img':
+                # Extract product images
+                img_url = next(filter(None, map(node_attrs.get, self._IMAGE_URL_ATTRIBUTES)), None)
+                if img_url:
+                    product_images.append(img_url)
+            elif node.tag == 'a':
+                # Extract product categories
+                cat_url = node_attrs.get('href')
+                product_cats.append({
+                    'name': node.text().strip(),
+                    'slug': url_slug(cat_url) if cat_url else '',
+                    'url': cat_url
+                })
         
-        # Extract product attributes
-        attributes = {}
-        attr_rows = soup.select('.woocommerce-product-attributes-item')
-        for row in attr_rows:
-            label = row.select_one('.woocommerce-product-attributes-item__label')
-            value = row.select_one('.woocommerce-product-attributes-item__value')
-            if label and value:
-                key = label.text.strip().rstrip(':')
-                attributes[key] = value.text.strip()
+        # Extract product name, price and descriptions
+        for field in ('name', 'price', 'short_description', 'description'):
+            if field in fields:
+                product[field] = fields[field].text().strip()
         
+        product['categories'] = product_cats
+        product['images'] = product_images
         product['attributes'] = attributes
         
         logger.info(f"Extracted details for product: {product.get('name', product['slug'])}")
         return product
     
-    def extract_category_details(self, soup, url):
+    def extract_category_details(self, tree, url):
         """Extract category details from a category page"""
         category = {
             'url': url,
-            'slug': urlparse(url).path.split('/')[-2] if urlparse(url).path.endswith('/') else urlparse(url).path.split('/')[-1]
+            'slug': url_slug(url)
         }
         
         # Extract category name
-        category_name = soup.select_one('.woocommerce-products-header__title')
-        if category_name:
-            category['name'] = category_name.text.strip()
+        category_name = tree.css_first(self._CATEGORY_NAME_SELECTOR)
+        if category_name is not None:
+            category['name'] = category_name.text().strip()
         else:
             # Try alternative selectors
-            category_name = soup.select_one('h1.page-title')
-            if category_name:
-                category['name'] = category_name.text.strip()
+            category_name = tree.css_first(self._CATEGORY_NAME_FALLBACK_SELECTOR)
+            if category_name is not None:
+                category['name'] = category_name.text().strip()
         
         # Extract category description
-        category_desc = soup.select_one('.term-description')
-        if category_desc:
-            category['description'] = category_desc.text.strip()
+        category_desc = tree.css_first(self._CATEGORY_DESCRIPTION_SELECTOR)
+        if category_desc is not None:
+            category['description'] = category_desc.text().strip()
             
         logger.info(f"Extracted details for category: {category.get('name', category['slug'])}")
         return category
     
-    def scrape_shop_page(self):
-        """Scrape the main shop page to discover products and categories"""
+    async def scrape_shop_page(self, home_tree=None):
+        """Scrape the main shop page to discover products and categories
+        
+        home_tree is the already-fetched homepage, used instead of fetching '/' again
+        if /shop/ is unavailable.
+        """
         logger.info("Scraping main shop page")
         
         # First try the /shop/ URL
-        soup = self.fetch_page('/shop/')
-        if not soup:
-            # If that fails, try the root URL
-            soup = self.fetch_page('/')
+        tree = await self.fetch_page('/shop/')
+        if tree is None:
+            # If that fails, fall back to the root URL
+            tree = home_tree if home_tree is not None else await self.fetch_page('/')
         
-        if not soup:
+        if tree is None:
             logger.error("Failed to fetch the shop page")
-            return [], []
+            return set(), set()
         
         # Extract product and category links
-        product_links = self.extract_product_links(soup)
-        category_links = self.extract_category_links(soup)
+        product_links = self.extract_product_links(tree)
+        category_links = self.extract_category_links(tree)
         
         return product_links, category_links
     
-    def scrape_products(self, product_links, max_products=100):
-        """Scrape details for a list of products"""
-        products = []
-        
-        for i, url in enumerate(product_links[:max_products], 1):
-            logger.info(f"Scraping product {i}/{min(len(product_links), max_products)}: {url}")
-            soup = self.fetch_page(url)
-            if soup:
-                product = self.extract_product_details(soup, url)
-                products.append(product)
-        
-        # Save the scraped products
-        if products:
-            self.save_json(products, "scraped_products.json")
+    async def scrape_product(self, url):
+        """Fetch and extract a single product page"""
+        tree = await self.fetch_page(url)
+        return url, None if tree is None else self.extract_product_details(tree, url)
+    
+    async def scrape_products(self, product_links, max_products=100):
+        """Scrape details for a list of products, streaming each one to PRODUCTS_FILE
         
+        Products are written as they finish, so only in-flight pages are held in memory.
+        Returns the slug and categories of each product, which is all the summary needs.
+        """
+        products = []
+        urls = product_links[:max_products]
+        filepath = os.path.join(self.output_dir, PRODUCTS_FILE)
+        
+        # Fetch the pages concurrently and write each product as soon as it is extracted
+        with open(filepath, 'wb', buffering=65536) as f:
+            for i, scraped in enumerate(asyncio.as_completed([self.scrape_product(url) for url in urls]), 1):
+                url, product = await scraped
+                logger.info(f"Scraped product {i}/{len(urls)}: {url}")
+                if product is not None:
+                    f.write(dump_line(product))
+                    products.append({'slug': product['slug'], 'categories': product['categories']})
+        
+        logger.info(f"Saved {len(products)} products to {filepath}")
         return products
     
-    def scrape_categories(self, category_links):
+    async def scrape_categories(self, category_links):
         """Scrape details for a list of categories"""
         categories = []
+        category_links = list(category_links)
+        
+        # Fetch the pages concurrently, then extract them in link order
+        trees = await asyncio.gather(*(self.fetch_page(url) for url in category_links))
         
-        for i, url in enumerate(category_links, 1):
+        for i, (url, tree) in enumerate(zip(category_links, trees), 1):
             logger.info(f"Scraping category {i}/{len(category_links)}: {url}")
-            soup = self.fetch_page(url)
-            if soup:
-                category = self.extract_category_details(soup, url)
+            if tree is not None:
+                category = self.extract_category_details(tree, url)
                 categories.append(category)
                 
                 # Also look for product links on the category page
-                product_links = self.extract_product_links(soup)
-                category['product_links'] = product_links
+                category['product_links'] = list(self.extract_product_links(tree))
         
         # Save the scraped categories
         if categories:
@@ -257,18 +348,18 @@ class VogoWebScraper:
         
         return categories
     
-    def discover_menu_items(self, soup):
+    def discover_menu_items(self, tree):
         """Extract menu items from the main navigation"""
         menu_items = []
         
-        # Find all navigation menu items
-        nav_items = soup.select('.menu-item a') or soup.select('nav a') or soup.select('#menu-main-menu a')
+        # Find all navigation menu links in a single pass over the tree
+        nav_items = tree.css(self._MENU_LINK_SELECTOR)
         
         for item in nav_items:
-            href = item.get('href')
+            href = item.attributes.get('href')
             if href and self.base_url in href:
                 menu_items.append({
-                    'text': item.text.strip(),
+                    'text': item.text().strip(),
                     'url': href,
                     'slug': urlparse(href).path.strip('/')
                 })
@@ -280,30 +371,37 @@ class VogoWebScraper:
             
         return menu_items
     
-    def run_full_scrape(self):
+    async def run_full_scrape(self):
         """Run a full scrape of the website"""
         logger.info("Starting full website scrape")
         
         # Scrape the homepage to get menu items
-        home_soup = self.fetch_page('/')
-        if home_soup:
-            menu_items = self.discover_menu_items(home_soup)
+        home_tree = await self.fetch_page('/')
+        if home_tree is not None:
+            menu_items = self.discover_menu_items(home_tree)
         
         # Scrape the shop page to get products and categories
-        product_links, category_links = self.scrape_shop_page()
+        product_links, category_links = await self.scrape_shop_page(home_tree)
         
         # Scrape individual categories
-        categories = self.scrape_categories(category_links)
+        categories = await self.scrape_categories(category_links)
         
         # Gather more product links from categories
-        all_product_links = set(product_links)
-        for category in categories:
-            all_product_links.update(category.get('product_links', []))
+        all_product_links = product_links.union(*(category.get('product_links', []) for category in categories))
         
         logger.info(f"Found a total of {len(all_product_links)} unique product links")
         
         # Scrape individual products
-        products = self.scrape_products(list(all_product_links))
+        products = await self.scrape_products(list(all_product_links))
+        
+        # Organize products by category
+        product_by_category = defaultdict(list)
+        for product in products:
+            product_slug = product.get('slug')
+            for category in product.get('categories', ()):
+                cat_slug = category.get('slug')
+                if cat_slug:
+                    product_by_category[cat_slug].append(product_slug)
         
         # Generate a summary of everything found
         summary = {
@@ -311,27 +409,24 @@ class VogoWebScraper:
             'category_count': len(categories),
             'all_product_slugs': [p.get('slug') for p in products],
             'all_category_slugs': [c.get('slug') for c in categories],
-            'product_by_category': {}
+            'product_by_category': dict(product_by_category)
         }
         
-        # Organize products by category
-        for product in products:
-            for category in product.get('categories', []):
-                cat_slug = category.get('slug')
-                if cat_slug:
-                    if cat_slug not in summary['product_by_category']:
-                        summary['product_by_category'][cat_slug] = []
-                    summary['product_by_category'][cat_slug].append(product.get('slug'))
-        
         # Save the summary
         self.save_json(summary, "scrape_summary.json")
         
         logger.info(f"Scraping complete! Found {len(products)} products and {len(categories)} categories")
         return summary
 
-if __name__ == "__main__":
+async def main():
     scraper = VogoWebScraper()
-    summary = scraper.run_full_scrape()
+    try:
+        return await scraper.run_full_scrape()
+    finally:
+        await scraper.aclose()
+
+if __name__ == "__main__":
+    summary = asyncio.run(main())
     
     # Print a brief summary of what was found
     print("\n=== SCRAPING RESULTS ===")
@@ -1,14 +1,43 @@
 #!/usr/bin/env python3
 import os
 import json
+import contextlib
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from woocommerce import API
 from pprint import pprint
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:  # optional; every request goes to the store
+    requests_cache = None
+
 # Load environment variables
 load_dotenv()
 
+# Custom endpoints probed at once by explore_custom_endpoints
+MAX_PROBE_WORKERS = 8
+# Listing pages fetched at once after page 1 reports the page count
+MAX_PAGE_WORKERS = 8
+# Retry GETs on connection errors and transient server responses, honouring Retry-After
+RETRY = Retry(total=5, backoff_factor=0.3,
+              status_forcelist=(429, 500, 502, 503, 504),
+              allowed_methods=("GET",), respect_retry_after_header=True, raise_on_status=False)
+# Local HTTP cache (requests-cache, sqlite) so repeated explorations revalidate instead of refetching
+HTTP_CACHE_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".woo_http_cache")
+HTTP_CACHE_OPTIONS = {"backend": "sqlite", "expire_after": 3600, "cache_control": True}
+# Compressed transfer encodings to ask for; br only when a Brotli decoder is installed
+ACCEPT_ENCODING = ", ".join(["gzip", "deflate"] + (["br"] if any(find_spec(m) for m in ("brotli", "brotlicffi")) else []))
+
 class WooCommerceExplorer:
     def __init__(self):
         """Initialize WooCommerce API explorer"""
@@ -32,15 +61,37 @@ class WooCommerceExplorer:
         # Initialize Store API URL
         self.store_api_url = f"{self.api_url}/wp-json/wc/store/v1"
         
+        # Shared keep-alive session for the raw wp-json and Store API requests
+        if requests_cache is not None:
+            self.http = requests_cache.CachedSession(HTTP_CACHE_NAME, **HTTP_CACHE_OPTIONS)
+        else:
+            self.http = requests.Session()
+        self.http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=RETRY))
+        self.http.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        
         # Output directory
         self.output_dir = "woocommerce_data"
         os.makedirs(self.output_dir, exist_ok=True)
     
+    def cached_wcapi(self):
+        """Serve the wc/v3 client's GETs from the HTTP cache as well
+        
+        The woocommerce client calls requests.request() directly rather than through a
+        session we can swap, so the cache is installed for the duration of the block.
+        """
+        if requests_cache is None:
+            return contextlib.nullcontext()
+        return requests_cache.enabled(HTTP_CACHE_NAME, **HTTP_CACHE_OPTIONS)
+    
     def save_json(self, data, filename):
         """Save data to a JSON file"""
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"Saved data to {filepath}")
         return filepath
     
@@ -50,7 +101,7 @@ class WooCommerceExplorer:
         
         # Try to get the API index
         try:
-            response = requests.get(f"{self.api_url}/wp-json/")
+            response = self.http.get(f"{self.api_url}/wp-json/")
             if response.status_code == 200:
                 routes = response.json().get("routes", {})
                 
@@ -71,6 +122,36 @@ class WooCommerceExplorer:
         
         return {}
     
+    def fetch_pages(self, get_page, label, max_pages=10):
+        """Fetch page 1, then the remaining pages it reports (X-WP-TotalPages) concurrently"""
+        print(f"Fetching {label} page 1...")
+        response = get_page(1)
+        
+        if response.status_code != 200:
+            print(f"Error fetching {label}: {response.status_code}")
+            return []
+        
+        items = response.json()
+        print(f"Found {len(items)} {label} on page 1")
+        
+        total_pages = min(int(response.headers.get('X-WP-TotalPages', '1')), max_pages)
+        if total_pages > 1:
+            pages = range(2, total_pages + 1)
+            print(f"Fetching {label} pages 2-{total_pages}...")
+            
+            with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+                for page, response in zip(pages, executor.map(get_page, pages)):
+                    if response.status_code != 200:
+                        print(f"Error fetching {label} page {page}: {response.status_code}")
+                        break
+                    
+                    page_items = response.json()
+                    print(f"Found {len(page_items)} {label} on page {page}")
+                    items.extend(page_items)
+        
+        print(f"Reached last page of {label} ({total_pages})")
+        return items
+    
     def get_products(self, per_page=100, max_pages=10):
         """Get all products using pagination"""
         print("\n=== FETCHING ALL PRODUCTS ===")
@@ -78,32 +159,10 @@ class WooCommerceExplorer:
         
         # Try using the authenticated API
         try:
-            for page in range(1, max_pages + 1):
-                print(f"Fetching products page {page}...")
-                
-                response = self.wcapi.get("products", params={
-                    "per_page": per_page,
-                    "page": page
-                })
-                
-                if response.status_code != 200:
-                    print(f"Error fetching products: {response.status_code}")
-                    break
-                
-                products = response.json()
-                
-                if not products:
-                    print("No more products found.")
-                    break
-                
-                print(f"Found {len(products)} products on page {page}")
-                all_products.extend(products)
-                
-                # Check if we've reached the last page
-                total_pages = int(response.headers.get('X-WP-TotalPages', '1'))
-                if page >= total_pages:
-                    print(f"Reached last page of products ({total_pages})")
-                    break
+            all_products = self.fetch_pages(
+                lambda page: self.wcapi.get("products", params={"per_page": per_page, "page": page}),
+                "products", max_pages
+            )
         
         except Exception as auth_error:
             print(f"Error using authenticated API: {str(auth_error)}")
@@ -111,31 +170,11 @@ class WooCommerceExplorer:
             # Fall back to Store API
             try:
                 print("Falling back to Store API...")
-                
-                for page in range(1, max_pages + 1):
-                    url = f"{self.store_api_url}/products"
-                    response = requests.get(url, params={
-                        "per_page": per_page,
-                        "page": page
-                    })
-                    
-                    if response.status_code != 200:
-                        print(f"Error fetching products from Store API: {response.status_code}")
-                        break
-                    
-                    products = response.json()
-                    
-                    if not products:
-                        print("No more products found.")
-                        break
-                    
-                    print(f"Found {len(products)} products on page {page}")
-                    all_products.extend(products)
-                    
-                    # Check if we've reached the last page
-                    if len(products) < per_page:
-                        print("Reached last page of products")
-                        break
+                url = f"{self.store_api_url}/products"
+                all_products = self.fetch_pages(
+                    lambda page: self.http.get(url, params={"per_page": per_page, "page": page}),
+                    "products", max_pages
+                )
             
             except Exception as store_error:
                 print(f"Error fetching from Store API: {str(store_error)}")
@@ -149,21 +188,18 @@ class WooCommerceExplorer:
         
         return all_products
     
-    def get_categories(self):
+    def get_categories(self, per_page=100, max_pages=10):
         """Get all product categories"""
         print("\n=== FETCHING ALL CATEGORIES ===")
         all_categories = []
         
         # Try the authenticated API
         try:
-            response = self.wcapi.get("products/categories", params={"per_page": 100})
-            
-            if response.status_code == 200:
-                categories = response.json()
-                all_categories.extend(categories)
-                print(f"Found {len(categories)} categories using authenticated API")
-            else:
-                print(f"Error fetching categories: {response.status_code}")
+            all_categories = self.fetch_pages(
+                lambda page: self.wcapi.get("products/categories", params={"per_page": per_page, "page": page}),
+                "categories", max_pages
+            )
+            print(f"Found {len(all_categories)} categories using authenticated API")
         
         except Exception as auth_error:
             print(f"Error using authenticated API for categories: {str(auth_error)}")
@@ -172,14 +208,11 @@ class WooCommerceExplorer:
             try:
                 print("Falling back to Store API for categories...")
                 url = f"{self.store_api_url}/products/categories"
-                response = requests.get(url, params={"per_page": 100})
-                
-                if response.status_code == 200:
-                    categories = response.json()
-                    all_categories.extend(categories)
-                    print(f"Found {len(categories)} categories using Store API")
-                else:
-                    print(f"Error fetching categories from Store API: {response.status_code}")
+                all_categories = self.fetch_pages(
+                    lambda page: self.http.get(url, params={"per_page": per_page, "page": page}),
+                    "categories", max_pages
+                )
+                print(f"Found {len(all_categories)} categories using Store API")
             
             except Exception as store_error:
                 print(f"Error fetching categories from Store API: {str(store_error)}")
@@ -274,10 +307,21 @@ class WooCommerceExplorer:
         
         results = {}
         
-        for endpoint in custom_endpoints:
+        def probe(endpoint):
+            try:
+                return self.wcapi.get(endpoint)
+            except Exception as e:
+                return e
+        
+        # Probe the endpoints concurrently; responses are handled (and saved) here in list order
+        with ThreadPoolExecutor(max_workers=MAX_PROBE_WORKERS) as executor:
+            responses = list(executor.map(probe, custom_endpoints))
+        
+        for endpoint, response in zip(custom_endpoints, responses):
             print(f"Trying endpoint: {endpoint}")
             try:
-                response = self.wcapi.get(endpoint)
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -310,26 +354,27 @@ class WooCommerceExplorer:
         print("STARTING FULL WOOCOMMERCE EXPLORATION")
         print("====================================")
         
-        # Step 1: Discover API endpoints
-        self.discover_endpoints()
-        
-        # Step 2: Get all products
-        products = self.get_products()
-        
-        # Step 3: Get all categories
-        categories = self.get_categories()
-        
-        # Step 4: Get sample orders
-        self.get_orders()
-        
-        # Step 5: Get shipping methods
-        self.get_shipping_methods()
-        
-        # Step 6: Get payment gateways
-        self.get_payment_gateways()
-        
-        # Step 7: Explore custom endpoints
-        self.explore_custom_endpoints()
+        with self.cached_wcapi():
+            # Step 1: Discover API endpoints
+            self.discover_endpoints()
+            
+            # Step 2: Get all products
+            products = self.get_products()
+            
+            # Step 3: Get all categories
+            categories = self.get_categories()
+            
+            # Step 4: Get sample orders
+            self.get_orders()
+            
+            # Step 5: Get shipping methods
+            self.get_shipping_methods()
+            
+            # Step 6: Get payment gateways
+            self.get_payment_gateways()
+            
+            # Step 7: Explore custom endpoints
+            self.explore_custom_endpoints()
         
         # Step 8: Generate summary report
         self.generate_summary(products, categories)
@@ -0,0 +1,133 @@
+"""Shared HTTP helpers for the WooCommerce dump scripts (get_products.py, get_categories.py)"""
+import atexit
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; responses are then parsed in one go
+    ijson = None
+
+WC_API_URL = "https://vogo.family/wp-json/wc/v3"
+# Largest page size the WooCommerce REST API accepts
+WC_MAX_PER_PAGE = 100
+AUTH = (
+    os.environ.get("WP_CONSUMER_KEY", "ck_47075e7afebb1ad956d0350ee9ada1c93f3dbbaa"),
+    os.environ.get("WP_CONSUMER_SECRET", "cs_c264cd481899b999ce5cd3cc3b97ff7cb32aab07")
+)
+
+# ETags and bodies of earlier responses, kept between runs
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".api_cache.json")
+
+# (connect, read) timeout for every request
+REQUEST_TIMEOUT = (3, 10)
+
+SESSION = requests.Session()
+SESSION.auth = AUTH
+# Retry GETs on connection errors and transient server responses
+_adapter = HTTPAdapter(pool_maxsize=20,
+                       max_retries=Retry(total=3, backoff_factor=0.3,
+                                         status_forcelist=(429, 500, 502, 503, 504),
+                                         allowed_methods=("GET",), raise_on_status=False))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+
+def _load_disk_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+DISK_CACHE = _load_disk_cache()
+_dirty = False
+
+
+@atexit.register
+def _save_disk_cache():
+    if not _dirty:
+        return
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(DISK_CACHE, f)
+
+
+def _parse_json(response):
+    """Decode a JSON response body from its bytes when orjson is installed, skipping the str decode"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+@lru_cache(maxsize=128)
+def _cached_get(endpoint, params_key):
+    global _dirty
+    key = json.dumps([endpoint, params_key])
+    entry = DISK_CACHE.get(key)
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+
+    response = SESSION.get(f"{WC_API_URL}/{endpoint}", params=dict(params_key), headers=headers,
+                           timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304:
+        # Unchanged since the last run: no body was sent, reuse the stored one
+        return entry["body"]
+    response.raise_for_status()
+
+    body = _parse_json(response)
+    DISK_CACHE[key] = {"etag": response.headers.get("ETag"), "body": body}
+    _dirty = True
+    return body
+
+
+def cached_get(endpoint, params=None):
+    """GET a WooCommerce endpoint, revalidating the previous run's copy with If-None-Match
+
+    Repeated calls with the same arguments in one process are answered from memory.
+    """
+    return _cached_get(endpoint, tuple(sorted((params or {}).items())))
+
+
+def _decode_items(response):
+    """Yield the items of a streamed list response, parsing it whole when ijson isn't installed"""
+    if ijson is None:
+        yield from _parse_json(response)
+        return
+    response.raw.decode_content = True
+    yield from ijson.items(response.raw, "item", use_float=True)
+
+
+def _get_page(endpoint, params, page):
+    response = SESSION.get(f"{WC_API_URL}/{endpoint}", params={**params, "page": page},
+                           timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return _parse_json(response)
+
+
+def iter_all_items(endpoint, params=None, max_workers=8):
+    """Yield every item of a paginated list endpoint, in page order
+
+    Page 1 is streamed; its X-WP-TotalPages header tells how many more pages
+    there are, and those are fetched concurrently while page 1 is consumed.
+    """
+    params = {"per_page": WC_MAX_PER_PAGE, **(params or {})}
+    with SESSION.get(f"{WC_API_URL}/{endpoint}", params={**params, "page": 1}, stream=True,
+                     timeout=REQUEST_TIMEOUT) as first:
+        first.raise_for_status()
+        total_pages = int(first.headers.get("X-WP-TotalPages") or 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(total_pages - 1, max_workers))) as executor:
+            rest = executor.map(partial(_get_page, endpoint, params), range(2, total_pages + 1))
+            yield from _decode_items(first)
+            for page in rest:
+                yield from page